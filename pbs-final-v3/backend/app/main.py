@@ -1,14 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, Response
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
 
-from .routers import telemetry, route, metrics, feedback, resources, jobs, pricing
+from .routers import dashboard, telemetry, route, metrics, feedback, resources, jobs, pricing
 from .core.config import settings
 
 app = FastAPI(
     title="PBS Final v3 – Hybrid Workload Router",
     version="0.3.0",
-    description="Telemetry ingestion, explainable scoring, SLA-aware routing, Prometheus metrics."
+    description="Telemetry ingestion, explainable scoring, SLA-aware routing, Prometheus metrics.",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -23,6 +24,7 @@ app.include_router(telemetry.router, tags=["telemetry"])
 app.include_router(resources.router, tags=["resources"])
 app.include_router(route.router, tags=["routing"])
 app.include_router(jobs.router, tags=["jobs"])
+app.include_router(dashboard.router, tags=["dashboard"])
 app.include_router(pricing.router, tags=["pricing"])
 app.include_router(feedback.router, tags=["feedback"])
 app.include_router(metrics.router, tags=["metrics"])
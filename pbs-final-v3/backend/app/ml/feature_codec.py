@@ -1,15 +1,64 @@
-from __future__ import annotations
-import json
-
-def to_dict(obj) -> dict:
-    # pydantic v2
-    if hasattr(obj, "model_dump"):
-        return obj.model_dump()
-    # pydantic v1
-    if hasattr(obj, "dict"):
-        return obj.dict()
-    # dataclass / plain object
-    try:
-        return dict(vars(obj))
-    except Exception:
-        return json.loads(json.dumps(obj))
+from __future__ import annotations
+import dataclasses
+import json
+
+try:
+    import orjson
+    _dumps_bytes = orjson.dumps
+except ImportError:  # stdlib fallback keeps the codec importable
+    def _dumps_bytes(o) -> bytes:
+        return json.dumps(o, ensure_ascii=False).encode()
+
+# Memoized conversion strategy per concrete type, so repeated calls skip
+# the hasattr probing after the first object of a given class.
+_STRATEGY: dict[type, str] = {}
+
+def to_dict(obj, job_req=None, tel=None) -> dict:
+    """Convert a feature object to a plain dict.
+
+    When job_req/tel are given, the categorical + routing-critical keys
+    (job_type, resource_type, gpu/SLA fields) are added here in the same
+    pass instead of callers mutating the returned dict afterwards —
+    one dict build, no post-hoc resizes.
+    """
+    t = type(obj)
+    s = _STRATEGY.get(t)
+    if s is None:
+        if hasattr(obj, "model_dump"):  # pydantic v2
+            s = "model_dump"
+        elif hasattr(obj, "dict"):  # pydantic v1
+            s = "dict"
+        elif dataclasses.is_dataclass(obj):  # handles __slots__ dataclasses too
+            s = "dataclass"
+        else:
+            s = "vars"
+        _STRATEGY[t] = s
+
+    if s == "model_dump":
+        out = obj.model_dump()
+    elif s == "dict":
+        out = obj.dict()
+    elif s == "dataclass":
+        out = dataclasses.asdict(obj)
+    else:
+        # plain object
+        try:
+            out = dict(vars(obj))
+        except Exception:
+            out = json.loads(json.dumps(obj))
+
+    if job_req is not None and tel is not None:
+        out["job_type"] = job_req.job_type
+        out["resource_type"] = tel.resource_type
+        out["requires_gpu"] = bool(job_req.requires_gpu)
+        out["allow_sla_fallback"] = bool(job_req.allow_sla_fallback)
+        sla = getattr(job_req, "sla", None)
+        if sla:
+            out["sla_deadline_ms"] = sla.deadline_ms
+            out["sla_max_cost_usd"] = sla.max_cost_usd
+            out["sla_min_reliability"] = sla.min_reliability
+    return out
+
+def to_json_bytes(obj, job_req=None, tel=None) -> bytes:
+    """Serialized form of to_dict; callers decode once or bind the bytes."""
+    return _dumps_bytes(to_dict(obj, job_req, tel))
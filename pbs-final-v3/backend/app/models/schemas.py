@@ -1,15 +1,21 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Literal, Dict, Any, List
 from datetime import datetime
 
 ResourceType = Literal["edge", "cloud", "gpu"]
 
 class SLA(BaseModel):
+    # frozen: instances are shared across attempt retries and cache keys,
+    # so nobody may mutate them in place (use model_copy(update=...))
+    model_config = ConfigDict(frozen=True)
+
     deadline_ms: Optional[int] = Field(default=None, description="Hard deadline for completion (ms).")
     max_cost_usd: Optional[float] = Field(default=None, description="Hard cost cap for job (USD).")
     min_reliability: Optional[float] = Field(default=None, description="Minimum acceptable reliability (0..1).")
 
 class JobRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     job_id: str
     job_type: Literal["batch", "inference", "training"]
     urgency: float = Field(ge=0.0, le=1.0, description="0=not urgent, 1=critical")
@@ -64,4 +70,5 @@ class RouteDecision(BaseModel):
     chosen_resource_id: str
     chosen_resource_type: ResourceType
     considered: List[Dict[str, Any]]
+    chosen_score: Optional[Dict[str, Any]] = None
     explanation: str
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from datetime import datetime
-import json
+import time
+import numpy as np
+import orjson
 
 from ..models.schemas import JobRequest
 from ..services.routing import route
@@ -13,6 +15,7 @@ from ..services.storage import (
     update_job,
     get_job,
     list_jobs,
+    list_sla_event_jobs,
     add_job_event,
     list_job_events,
 )
@@ -31,16 +34,17 @@ class CompletePayload(BaseModel):
 def submit_job(job: JobRequest):
     decision = route(job)
 
-    # Find chosen score (for predictions)
-    chosen_score = None
-    for item in decision.considered:
-        if item["resource_id"] == decision.chosen_resource_id:
-            chosen_score = item["score"]
-            break
+    # Chosen score (for predictions) comes straight off the decision
+    chosen_score = decision.chosen_score
 
     now = datetime.utcnow().isoformat()
     status = "BLOCKED" if decision.chosen_resource_id == "none" else "QUEUED"
 
+    # One dump feeds both the scalar columns and the stored JSON blob,
+    # instead of pydantic serializing the model twice.
+    job_dict = job.model_dump(mode="json")
+    sla = job_dict["sla"]
+
     row = {
         "job_id": job.job_id,
         "job_type": job.job_type,
@@ -48,10 +52,13 @@ def submit_job(job: JobRequest):
         "payload_size_mb": float(job.payload_size_mb),
         "requires_gpu": int(job.requires_gpu),
         "allow_sla_fallback": int(job.allow_sla_fallback),
-        "sla_deadline_ms": job.sla.deadline_ms,
-        "sla_max_cost_usd": job.sla.max_cost_usd,
-        "sla_min_reliability": job.sla.min_reliability,
-        "job_request_json": job.model_dump_json(),
+        "sla_deadline_ms": sla["deadline_ms"],
+        "sla_max_cost_usd": sla["max_cost_usd"],
+        "sla_min_reliability": sla["min_reliability"],
+        # integer epoch-ms deadline; the SLA monitor compares this
+        # against time.time() without any datetime parsing
+        "deadline_at_ms": (int(time.time() * 1000) + int(sla["deadline_ms"])) if sla["deadline_ms"] is not None else None,
+        "job_request_json": orjson.dumps(job_dict).decode(),
         "status": status,
         "attempts": 0,
         "max_attempts": 2,
@@ -65,7 +72,7 @@ def submit_job(job: JobRequest):
         "predicted_cost_usd": float(chosen_score["cost_pred_usd"]) if chosen_score else None,
         "final_score": float(chosen_score["final_score"]) if chosen_score else None,
         "sla_ok": int(chosen_score["sla_ok"]) if chosen_score else 0,
-        "sla_violations_json": json.dumps(chosen_score.get("sla_violations", []) if chosen_score else []),
+        "sla_violations_json": orjson.dumps(chosen_score.get("sla_violations", []) if chosen_score else []).decode(),
         "actual_latency_ms": None,
         "actual_cost_usd": None,
         "output_ref": None,
@@ -112,27 +119,24 @@ def complete_job(job_id: str, payload: CompletePayload):
     return {"ok": True}
 
 @router.get("/sla-events", summary="List SLA-related job events")
-def sla_events(limit: int = 200):
-    jobs = list_jobs(limit=2000)
+def sla_events(limit: int = 200, offset: int = 0):
     out = []
-    for j in jobs:
+    for j in list_sla_event_jobs(limit=limit, offset=offset):
         try:
-            violations = json.loads(j.get("sla_violations_json") or "[]")
+            violations = orjson.loads(j.get("sla_violations_json") or "[]")
         except Exception:
             violations = []
-        sla_ok = int(j.get("sla_ok") or 0)
-        if j.get("status") == "BLOCKED" or (not sla_ok and len(violations) > 0):
-            out.append({
-                "job_id": j.get("job_id"),
-                "status": j.get("status"),
-                "chosen_resource_id": j.get("chosen_resource_id"),
-                "chosen_resource_type": j.get("chosen_resource_type"),
-                "predicted_latency_ms": j.get("predicted_latency_ms"),
-                "predicted_cost_usd": j.get("predicted_cost_usd"),
-                "violations": violations,
-                "updated_at": j.get("updated_at"),
-            })
-    return out[:limit]
+        out.append({
+            "job_id": j.get("job_id"),
+            "status": j.get("status"),
+            "chosen_resource_id": j.get("chosen_resource_id"),
+            "chosen_resource_type": j.get("chosen_resource_type"),
+            "predicted_latency_ms": j.get("predicted_latency_ms"),
+            "predicted_cost_usd": j.get("predicted_cost_usd"),
+            "violations": violations,
+            "updated_at": j.get("updated_at"),
+        })
+    return out
 
 @router.get("/model-metrics", summary="Compute simple model performance metrics from completed jobs")
 def model_metrics():
@@ -146,26 +150,26 @@ def model_metrics():
     if not completed:
         return {"note": "No completed jobs with actuals yet. Run the worker and submit jobs."}
 
-    lat_err = [
-        abs(float(j["actual_latency_ms"]) - float(j["predicted_latency_ms"]))
-        for j in completed
-    ]
+    n = len(completed)
+    lat_actual = np.fromiter((j["actual_latency_ms"] for j in completed), dtype=np.float64, count=n)
+    lat_pred = np.fromiter((j["predicted_latency_ms"] for j in completed), dtype=np.float64, count=n)
+    lat_mae = float(np.abs(lat_actual - lat_pred).mean())
+
     cost_completed = [
         j for j in completed
         if j.get("actual_cost_usd") is not None and j.get("predicted_cost_usd") is not None
     ]
-    cost_err = [
-        abs(float(j["actual_cost_usd"]) - float(j["predicted_cost_usd"]))
-        for j in cost_completed
-    ]
-
-    def mean(xs): 
-        return sum(xs) / len(xs) if xs else None
+    cost_mae = None
+    if cost_completed:
+        nc = len(cost_completed)
+        cost_actual = np.fromiter((j["actual_cost_usd"] for j in cost_completed), dtype=np.float64, count=nc)
+        cost_pred = np.fromiter((j["predicted_cost_usd"] for j in cost_completed), dtype=np.float64, count=nc)
+        cost_mae = float(np.abs(cost_actual - cost_pred).mean())
 
     return {
-        "completed_jobs": len(completed),
-        "latency_mae_ms": mean(lat_err),
-        "cost_mae_usd": mean(cost_err),
+        "completed_jobs": n,
+        "latency_mae_ms": lat_mae,
+        "cost_mae_usd": cost_mae,
     }
 @router.get("/{job_id}", summary="Get a single job")
 def get_job_by_id(job_id: str):
@@ -174,7 +178,7 @@ def get_job_by_id(job_id: str):
         raise HTTPException(status_code=404, detail="job_id not found")
     # deserialize violations for convenience
     try:
-        j["sla_violations"] = json.loads(j.get("sla_violations_json") or "[]")
+        j["sla_violations"] = orjson.loads(j.get("sla_violations_json") or "[]")
     except Exception:
         j["sla_violations"] = []
     return j
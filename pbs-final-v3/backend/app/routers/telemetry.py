@@ -1,44 +1,81 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
 from ..models.schemas import TelemetryPoint, TelemetryBatch
-from ..services.storage import insert_point, latest_point
+from ..services.storage import insert_point, insert_points_bulk, latest_point
 from ..services.metrics_registry import TELEMETRY_INGEST_COUNTER, TELEMETRY_LAST_TIMESTAMP_SECONDS
 from ..services.pricing import get_price_for_resource_type
 
 router = APIRouter(prefix="/telemetry")
 
+# Types that get price enrichment; frozenset membership is one hashed
+# probe instead of a tuple build + two string compares per point.
+_PRICED_TYPES = frozenset({"cloud", "gpu"})
+
 @router.post("", summary="Ingest a telemetry point")
 def post_point(p: TelemetryPoint):
-    # Auto-enrich pricing for cloud/gpu if missing or zero
-    if p.resource_type in ("cloud", "gpu") and (p.price_per_hour_usd is None or float(p.price_per_hour_usd) <= 0.0):
+    # Auto-enrich pricing for cloud/gpu if missing or zero. Enriched
+    # values stay in locals — mutating the validated model would pay
+    # pydantic assignment overhead for nothing.
+    price = p.price_per_hour_usd
+    source = None
+    if p.resource_type in _PRICED_TYPES and (price or 0.0) <= 0.0:
         fetched = get_price_for_resource_type(p.resource_type)
         if fetched is not None:
-            p.price_per_hour_usd = fetched
-            p.extra["price_source"] = "azure_retail_prices"
+            price = fetched
+            source = "azure_retail_prices"
         else:
-            p.extra["price_source"] = "fallback_simulated_or_missing"
+            source = "fallback_simulated_or_missing"
 
-    insert_point(p)
+    insert_point(p, price_per_hour_usd=price, price_source=source)
     TELEMETRY_INGEST_COUNTER.labels(resource_type=p.resource_type).inc()
     TELEMETRY_LAST_TIMESTAMP_SECONDS.labels(resource_type=p.resource_type).set(p.ts.timestamp())
     return {"ok": True}
 
-@router.post("/batch", summary="Ingest telemetry points (batch)")
-def post_batch(b: TelemetryBatch):
+def _ingest_batch(raw: bytes) -> dict:
+    # Validate straight from the raw body: pydantic-core parses JSON and
+    # validates in one pass, skipping FastAPI's json->dict->model detour.
+    try:
+        b = TelemetryBatch.model_validate_json(raw)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+
+    counts: dict = {}
+    last_ts: dict = {}
+    prices: dict = {}  # one pricing lookup per resource_type per batch
     for p in b.points:
         # Auto-enrich pricing for cloud/gpu if missing or zero
-        if p.resource_type in ("cloud", "gpu") and (p.price_per_hour_usd is None or float(p.price_per_hour_usd) <= 0.0):
-            fetched = get_price_for_resource_type(p.resource_type)
+        if p.resource_type in _PRICED_TYPES and (p.price_per_hour_usd or 0.0) <= 0.0:
+            if p.resource_type not in prices:
+                prices[p.resource_type] = get_price_for_resource_type(p.resource_type)
+            fetched = prices[p.resource_type]
             if fetched is not None:
                 p.price_per_hour_usd = fetched
                 p.extra["price_source"] = "azure_retail_prices"
             else:
                 p.extra["price_source"] = "fallback_simulated_or_missing"
 
-        insert_point(p)
-        TELEMETRY_INGEST_COUNTER.labels(resource_type=p.resource_type).inc()
-        TELEMETRY_LAST_TIMESTAMP_SECONDS.labels(resource_type=p.resource_type).set(p.ts.timestamp())
+        counts[p.resource_type] = counts.get(p.resource_type, 0) + 1
+        ts = p.ts.timestamp()
+        if ts > last_ts.get(p.resource_type, 0.0):
+            last_ts[p.resource_type] = ts
+
+    # One transaction + one metrics update per resource_type, not per point
+    insert_points_bulk(b.points)
+    for rtype, n in counts.items():
+        TELEMETRY_INGEST_COUNTER.labels(resource_type=rtype).inc(n)
+        TELEMETRY_LAST_TIMESTAMP_SECONDS.labels(resource_type=rtype).set(last_ts[rtype])
     return {"ok": True, "count": len(b.points)}
 
+
+@router.post("/batch", summary="Ingest telemetry points (batch)")
+async def post_batch(request: Request):
+    # Only the body read needs the event loop; validation and the
+    # blocking SQLite write run on the threadpool like every other
+    # (plain def) handler in this app, so large batches cannot stall
+    # concurrent requests.
+    return await run_in_threadpool(_ingest_batch, await request.body())
+
 @router.get("/latest/{resource_id}", response_model=TelemetryPoint)
 def get_latest(resource_id: str):
     p = latest_point(resource_id)
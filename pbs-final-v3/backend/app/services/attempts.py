@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 import uuid
 import json
 from datetime import datetime
@@ -8,14 +9,31 @@ from typing import Any, Dict, List, Optional
 
 from app.core.config import settings
 
+_TLS = threading.local()
+
 
 def _now() -> str:
     return datetime.utcnow().isoformat()
 
 
 def _conn() -> sqlite3.Connection:
-    con = sqlite3.connect(settings.db_path)
-    con.row_factory = sqlite3.Row
+    """Thread-local cached connection.
+
+    Every attempt helper used to open (and implicitly close) a fresh
+    connection; connection setup plus pragma application costs ~1ms per
+    call, which dominates these single-statement updates. The sqlite3
+    context manager only commits on exit, it never closes, so reusing
+    one connection per thread is safe with the existing `with` blocks.
+    """
+    con = getattr(_TLS, "con", None)
+    if con is None:
+        con = sqlite3.connect(settings.db_path)
+        con.row_factory = sqlite3.Row
+        con.execute("PRAGMA journal_mode=WAL;")
+        con.execute("PRAGMA synchronous=NORMAL;")
+        con.execute("PRAGMA busy_timeout=5000;")
+        con.execute("PRAGMA temp_store=MEMORY;")
+        _TLS.con = con
     return con
 
 
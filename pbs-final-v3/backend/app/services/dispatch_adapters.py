@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
+import json
 import os
 import time
 import random
@@ -63,10 +64,14 @@ class HttpAdapter(BaseAdapter):
             "chosen_resource_type": job.get("chosen_resource_type"),
             "job_request": None,
         }
-        # If stored, pass full job_request JSON to real runners
+        # If stored, pass full job_request to real runners; reuse the
+        # object the worker already parsed when it claimed the job.
         try:
-            if job.get("job_request_json"):
-                payload["job_request"] = __import__("json").loads(job["job_request_json"])
+            req = job.get("_job_request")
+            if req is not None:
+                payload["job_request"] = req.model_dump(mode="json")
+            elif job.get("job_request_json"):
+                payload["job_request"] = json.loads(job["job_request_json"])
         except Exception:
             pass
         timeout = float(os.getenv("DISPATCH_TIMEOUT_S", "20"))
@@ -10,14 +10,16 @@ def dispatch(job_row: Dict[str, Any]) -> DispatchResult:
 
     # Force-fail for testing reroute/retry (only on first attempt)
     attempts = int(job_row.get("attempts") or 0)
-    jr = job_row.get("job_request_json")
 
-    req = None
-    if jr:
-        try:
-            req = JobRequest.model_validate_json(jr)
-        except ValidationError:
-            req = None  # only swallow parsing errors
+    # Prefer the request object the worker already parsed for this claim
+    req = job_row.get("_job_request")
+    if req is None:
+        jr = job_row.get("job_request_json")
+        if jr:
+            try:
+                req = JobRequest.model_validate_json(jr)
+            except ValidationError:
+                req = None  # only swallow parsing errors
 
     # IMPORTANT: do NOT swallow forced failure
     if req:
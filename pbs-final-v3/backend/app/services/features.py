@@ -2,7 +2,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from ..models.schemas import TelemetryPoint, JobRequest
 
-@dataclass
+@dataclass(slots=True)
 class FeatureVector:
     congestion: float
     cpu_util: float
@@ -23,6 +23,33 @@ def compute_congestion(t: TelemetryPoint) -> float:
         base = (base + t.gpu_util) / 2.0
     return max(0.0, min(1.0, base))
 
+def build_features_dict(t: TelemetryPoint, job: JobRequest) -> dict:
+    """Feature dict for the ML scoring path, built in one allocation.
+
+    Scoring used to build a FeatureVector, convert it to a dict, then
+    patch in job_type / resource_type / latency_pred_ms one key at a
+    time; a single dict literal skips the intermediate dataclass.
+    latency_pred_ms starts at 0.0 and is overwritten once the latency
+    model has run (the cost model reads it).
+    """
+    return {
+        "congestion": compute_congestion(t),
+        "cpu_util": t.cpu_util,
+        "mem_util": t.mem_util,
+        "gpu_util": t.gpu_util,
+        "net_rtt_ms": t.net_rtt_ms,
+        "net_bw_mbps": t.net_bw_mbps,
+        "price_per_hour_usd": t.price_per_hour_usd,
+        "reliability": t.reliability,
+        "power_w": t.power_w,
+        "urgency": job.urgency,
+        "payload_size_mb": job.payload_size_mb,
+        "requires_gpu": job.requires_gpu,
+        "job_type": job.job_type,
+        "resource_type": t.resource_type,
+        "latency_pred_ms": 0.0,
+    }
+
 def build_features(t: TelemetryPoint, job: JobRequest) -> FeatureVector:
     return FeatureVector(
         congestion=compute_congestion(t),
@@ -1,24 +1,51 @@
 from __future__ import annotations
 from pathlib import Path
 import json
+import os
 import joblib
+import numpy as np
 import pandas as pd
 
+from .scoring_kernel import fallback_latency_means
+
 MODEL_DIR = Path(__file__).resolve().parents[2] / "models"
 MODEL_PATH = MODEL_DIR / "latency_model.joblib"
 META_PATH  = MODEL_DIR / "latency_model_metrics.json"
 
 _MODEL = None
 _META = None
+_COLS = None  # column order the fitted pipeline expects
+
+def _frame_for(model, rows: list[dict]) -> pd.DataFrame:
+    """Build the prediction frame from plain row lists.
+
+    pd.DataFrame([features]) re-infers column metadata from the dict(s)
+    on every call; caching the pipeline's fitted column order lets pandas
+    skip that. The pipeline one-hot-encodes categoricals, so a DataFrame
+    (not a bare ndarray) is still required.
+    """
+    global _COLS
+    if _COLS is None:
+        _COLS = list(getattr(model, "feature_names_in_", rows[0].keys()))
+    data = [[r.get(c, 0.0) for c in _COLS] for r in rows]
+    return pd.DataFrame(data, columns=_COLS)
 
 def model_version() -> str:
     meta = load_meta()
     return meta.get("model_version", "none")
 
 def load_model():
+    """Load (once) the latency pipeline.
+
+    Set PBS_MODEL_MMAP=1 to memory-map the artifact's numpy arrays
+    (joblib mmap_mode='r'): under multi-worker uvicorn/gunicorn the OS
+    then shares the parameter pages across processes instead of each
+    worker holding its own copy. Safe because predict only reads them.
+    """
     global _MODEL
     if _MODEL is None and MODEL_PATH.exists():
-        _MODEL = joblib.load(MODEL_PATH)
+        mmap_mode = "r" if os.getenv("PBS_MODEL_MMAP") == "1" else None
+        _MODEL = joblib.load(MODEL_PATH, mmap_mode=mmap_mode)
     return _MODEL
 
 def load_meta() -> dict:
@@ -46,10 +73,43 @@ def predict_latency(features: dict) -> dict:
                + 500.0 * float(features.get("congestion", 0.0))
         return {"mean_ms": mean, "p90_ms": mean * 1.25, "used": "fallback"}
 
-    X = pd.DataFrame([features])
+    X = _frame_for(model, [features])
     mean = float(model.predict(X)[0])
 
     q90 = float(meta.get("conformal_q90_ms", 0.0))
     p90 = mean + q90 if q90 > 0 else mean * 1.2
 
     return {"mean_ms": mean, "p90_ms": p90, "used": model_version()}
+
+def predict_latency_batch(features_list: list[dict]) -> list[dict]:
+    """Batched predict_latency: one model.predict on an N-row frame.
+
+    Scoring a route decision predicts latency for every candidate; doing
+    it row-by-row pays N DataFrame constructions and N sklearn dispatches
+    for the same answer.
+    """
+    if not features_list:
+        return []
+    model = load_model()
+    meta = load_meta()
+
+    if model is None:
+        n = len(features_list)
+        rtt = np.fromiter((float(f.get("net_rtt_ms", 0.0)) for f in features_list), dtype=np.float64, count=n)
+        payload = np.fromiter((float(f.get("payload_size_mb", 0.0)) for f in features_list), dtype=np.float64, count=n)
+        bw = np.fromiter((float(f.get("net_bw_mbps", 100.0)) for f in features_list), dtype=np.float64, count=n)
+        congestion = np.fromiter((float(f.get("congestion", 0.0)) for f in features_list), dtype=np.float64, count=n)
+        means = fallback_latency_means(rtt, payload, bw, congestion)
+        return [{"mean_ms": float(m), "p90_ms": float(m) * 1.25, "used": "fallback"} for m in means]
+
+    X = _frame_for(model, features_list)
+    means = model.predict(X)
+
+    q90 = float(meta.get("conformal_q90_ms", 0.0))
+    used = model_version()
+    out = []
+    for m in means:
+        mean = float(m)
+        p90 = mean + q90 if q90 > 0 else mean * 1.2
+        out.append({"mean_ms": mean, "p90_ms": p90, "used": used})
+    return out
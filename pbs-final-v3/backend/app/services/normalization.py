@@ -1,5 +1,8 @@
 from __future__ import annotations
 from typing import Dict
+
+import numpy as np
+
 from ..core.config import load_yaml_config
 
 CFG = load_yaml_config()
@@ -18,6 +21,17 @@ def _bounds(name: str):
         return float(b["min"]), float(b["max"])
     return DEFAULT_BOUNDS[name]
 
+# Bounds resolved once at import; normalize_scores runs per-candidate
+# per-route, so the repeated nested dict lookups added up.
+_BOUNDS_CACHE: Dict[str, tuple[float, float]] = {name: _bounds(name) for name in DEFAULT_BOUNDS}
+
+def reload_config() -> None:
+    """Re-read config.yaml and rebuild the cached bounds (tests / hot reload)."""
+    global CFG
+    CFG = load_yaml_config()
+    for name in DEFAULT_BOUNDS:
+        _BOUNDS_CACHE[name] = _bounds(name)
+
 def minmax01(x: float, min_v: float, max_v: float, invert: bool = False) -> float:
     if max_v <= min_v:
         return 0.0
@@ -27,11 +41,11 @@ def minmax01(x: float, min_v: float, max_v: float, invert: bool = False) -> floa
     return 1.0 - v if invert else v
 
 def normalize_scores(latency_ms: float, cost_usd: float, reliability: float, energy_w: float, congestion: float) -> Dict[str, float]:
-    lmin, lmax = _bounds("latency_ms")
-    cmin, cmax = _bounds("cost_usd")
-    rmin, rmax = _bounds("reliability")
-    emin, emax = _bounds("energy_w")
-    gmin, gmax = _bounds("congestion")
+    lmin, lmax = _BOUNDS_CACHE["latency_ms"]
+    cmin, cmax = _BOUNDS_CACHE["cost_usd"]
+    rmin, rmax = _BOUNDS_CACHE["reliability"]
+    emin, emax = _BOUNDS_CACHE["energy_w"]
+    gmin, gmax = _BOUNDS_CACHE["congestion"]
 
     return {
         "latency": minmax01(latency_ms, lmin, lmax, invert=True),
@@ -40,3 +54,31 @@ def normalize_scores(latency_ms: float, cost_usd: float, reliability: float, ene
         "energy": minmax01(energy_w, emin, emax, invert=True),
         "congestion": minmax01(congestion, gmin, gmax, invert=True),
     }
+
+def _minmax01_arr(x: np.ndarray, min_v: float, max_v: float, invert: bool = False) -> np.ndarray:
+    if max_v <= min_v:
+        return np.zeros_like(x)
+    v = np.clip((x - min_v) / (max_v - min_v), 0.0, 1.0)
+    return 1.0 - v if invert else v
+
+def normalize_scores_batch(
+    latency_ms: np.ndarray,
+    cost_usd: np.ndarray,
+    reliability: np.ndarray,
+    energy_w: np.ndarray,
+    congestion: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """Vectorized normalize_scores over equal-length candidate arrays."""
+    lmin, lmax = _BOUNDS_CACHE["latency_ms"]
+    cmin, cmax = _BOUNDS_CACHE["cost_usd"]
+    rmin, rmax = _BOUNDS_CACHE["reliability"]
+    emin, emax = _BOUNDS_CACHE["energy_w"]
+    gmin, gmax = _BOUNDS_CACHE["congestion"]
+
+    return {
+        "latency": _minmax01_arr(latency_ms, lmin, lmax, invert=True),
+        "cost": _minmax01_arr(cost_usd, cmin, cmax, invert=True),
+        "reliability": _minmax01_arr(reliability, rmin, rmax, invert=False),
+        "energy": _minmax01_arr(energy_w, emin, emax, invert=True),
+        "congestion": _minmax01_arr(congestion, gmin, gmax, invert=True),
+    }
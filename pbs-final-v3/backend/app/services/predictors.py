@@ -1,15 +1,23 @@
 from __future__ import annotations
-from dataclasses import asdict
+from functools import lru_cache
 from pathlib import Path
 import json
 
+import numpy as np
+
 from .features import FeatureVector
 
 MODEL_DIR = Path(__file__).resolve().parents[2] / "models_artifacts"
 LAT_PATH = MODEL_DIR / "latency_model.json"
 COST_PATH = MODEL_DIR / "cost_model.json"
 
+@lru_cache(maxsize=4)
 def _load(path: Path):
+    """Parsed params file, cached for the process lifetime.
+
+    Previously every prediction paid path.exists() + read_text +
+    json.loads. Call _load.cache_clear() after retraining to re-read.
+    """
     if not path.exists():
         return None
     try:
@@ -17,28 +25,56 @@ def _load(path: Path):
     except Exception:
         return None
 
-def _linpred(params: dict, x: dict) -> float:
-    b0 = float(params.get("bias", 0.0))
+@lru_cache(maxsize=4)
+def _param_bundle(path: Path):
+    """(bias, weight_keys, weight_vec) precomputed so _linpred is one dot product."""
+    params = _load(path)
+    if not params:
+        return None
     weights = params.get("weights", {})
-    y = b0
-    for k, w in weights.items():
-        y += float(w) * float(x.get(k, 0.0))
-    return y
+    keys = tuple(weights.keys())
+    vec = np.array([float(weights[k]) for k in keys], dtype=np.float64)
+    return float(params.get("bias", 0.0)), keys, vec
+
+def _linpred(bundle, f: FeatureVector) -> float:
+    # asdict(f) deep-copied the whole dataclass per call; attribute reads
+    # against the cached weight-key tuple skip that allocation entirely.
+    bias, keys, vec = bundle
+    xv = np.fromiter((float(getattr(f, k, 0.0)) for k in keys), dtype=np.float64, count=len(keys))
+    return float(bias + vec @ xv)
+
+def fallback_latency_vec(congestion: np.ndarray, net_rtt_ms: np.ndarray,
+                         payload_size_mb: np.ndarray, requires_gpu: np.ndarray) -> np.ndarray:
+    """Vectorized predict_latency_ms fallback: branchless over a candidate batch.
+
+    np.where replaces the per-candidate Python ternary so the whole
+    batch runs as SIMD adds/multiplies.
+    """
+    y = 50.0 + 800.0 * congestion + 1.2 * net_rtt_ms + 0.9 * payload_size_mb \
+        + np.where(requires_gpu, 400.0, 0.0)
+    return np.maximum(5.0, y)
+
+def fallback_cost_vec(congestion: np.ndarray, payload_size_mb: np.ndarray,
+                      requires_gpu: np.ndarray, price_per_hour_usd: np.ndarray,
+                      net_rtt_ms: np.ndarray, power_w: np.ndarray) -> np.ndarray:
+    """Vectorized predict_cost_usd fallback (element-wise identical)."""
+    est_seconds = 2.0 + 20.0 * congestion + 0.05 * payload_size_mb \
+        + np.where(requires_gpu, 10.0, 0.0)
+    y = (price_per_hour_usd / 3600.0) * est_seconds + 0.00001 * net_rtt_ms + 0.000002 * power_w
+    return np.maximum(0.0, y)
 
 def predict_latency_ms(f: FeatureVector) -> float:
-    params = _load(LAT_PATH)
-    x = asdict(f)
-    if params:
-        y = _linpred(params, x)
+    bundle = _param_bundle(LAT_PATH)
+    if bundle:
+        y = _linpred(bundle, f)
     else:
         y = 50.0 + 800.0 * f.congestion + 1.2 * f.net_rtt_ms + 0.9 * f.payload_size_mb + (400.0 if f.requires_gpu else 0.0)
     return max(5.0, float(y))
 
 def predict_cost_usd(f: FeatureVector) -> float:
-    params = _load(COST_PATH)
-    x = asdict(f)
-    if params:
-        y = _linpred(params, x)
+    bundle = _param_bundle(COST_PATH)
+    if bundle:
+        y = _linpred(bundle, f)
     else:
         est_seconds = 2.0 + 20.0 * f.congestion + 0.05 * f.payload_size_mb + (10.0 if f.requires_gpu else 0.0)
         y = (f.price_per_hour_usd / 3600.0) * est_seconds + 0.00001 * f.net_rtt_ms + 0.000002 * f.power_w
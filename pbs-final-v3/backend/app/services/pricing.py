@@ -1,5 +1,7 @@
 from __future__ import annotations
 from datetime import datetime, timedelta
+import atexit
+import time
 import httpx
 
 from .storage import get_cached_price, set_cached_price
@@ -12,6 +14,16 @@ DEFAULT_CLOUD_SKU = "Standard_D4as_v5"
 DEFAULT_GPU_SKU = "Standard_NC4as_T4_v3"
 
 CACHE_TTL_HOURS = 6
+RAM_TTL_SECONDS = 60.0
+
+# One client for the process: reuses keep-alive connections so repeated
+# lookups skip TCP+TLS setup instead of paying it per call.
+_CLIENT = httpx.Client(timeout=8.0, limits=httpx.Limits(max_keepalive_connections=4))
+atexit.register(_CLIENT.close)
+
+# Short-TTL RAM memo in front of the SQLite cache: bursts of lookups for
+# the same (region, sku) within a route decision never touch the DB.
+_RAM_CACHE: dict[str, tuple[float, float | None]] = {}
 
 def _cache_key(region: str, sku: str, currency: str) -> str:
     return f"azure:{region}:{sku}:{currency}"
@@ -25,9 +37,17 @@ def _is_fresh(updated_at_iso: str) -> bool:
 
 def fetch_azure_vm_price_per_hour_usd(region: str, sku: str, currency: str = "USD") -> float | None:
     key = _cache_key(region, sku, currency)
+
+    now = time.monotonic()
+    memo = _RAM_CACHE.get(key)
+    if memo and now - memo[0] < RAM_TTL_SECONDS:
+        return memo[1]
+
     cached = get_cached_price(key)
     if cached and _is_fresh(cached["updated_at"]):
-        return cached["price_per_hour_usd"]
+        price = cached["price_per_hour_usd"]
+        _RAM_CACHE[key] = (now, price)
+        return price
 
     flt = (
         f"serviceName eq 'Virtual Machines' and armRegionName eq '{region}' "
@@ -35,10 +55,9 @@ def fetch_azure_vm_price_per_hour_usd(region: str, sku: str, currency: str = "US
     )
     params = {"$filter": flt}
     try:
-        with httpx.Client(timeout=8.0) as client:
-            r = client.get(AZURE_URL, params=params)
-            r.raise_for_status()
-            data = r.json()
+        r = _CLIENT.get(AZURE_URL, params=params)
+        r.raise_for_status()
+        data = r.json()
 
         items = data.get("Items") or data.get("items") or []
         if not items:
@@ -54,6 +73,7 @@ def fetch_azure_vm_price_per_hour_usd(region: str, sku: str, currency: str = "US
 
         price = float(chosen["unitPrice"])
         set_cached_price(key, price, datetime.utcnow().isoformat())
+        _RAM_CACHE[key] = (now, price)
         return price
     except Exception:
         return None
@@ -1,9 +1,15 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Tuple, Set
+from typing import List, Dict, Any, Optional, Set
 
-from ..models.schemas import JobRequest, RouteDecision, TelemetryPoint
+import numpy as np
+
+from ..models.schemas import SLA, JobRequest, RouteDecision, TelemetryPoint
 from .storage import list_resources_latest
-from .scoring import score_resource
+from .scoring import score_resources_batch
+
+# How many considered candidates the decision payload carries; a partial
+# sort over N candidates is O(N log K) instead of O(N log N).
+TOP_K_CONSIDERED = 20
 
 
 def _eligible(t: TelemetryPoint, job: JobRequest) -> bool:
@@ -14,6 +20,21 @@ def _eligible(t: TelemetryPoint, job: JobRequest) -> bool:
     return True
 
 
+def route_from_mapping(req: Dict[str, Any]) -> RouteDecision:
+    """Route from an already-parsed request dict, skipping validation.
+
+    For callers that hold a dict loaded from jobs.job_request_json —
+    JSON this service dumped from a validated model at submit time —
+    re-validating through model_validate_json just to call route() is
+    pure overhead. model_construct assembles the instances (nested SLA
+    included) without the schema walk.
+    """
+    sla = req.get("sla")
+    if isinstance(sla, dict):
+        req = {**req, "sla": SLA.model_construct(**sla)}
+    return route(JobRequest.model_construct(**req))
+
+
 def route(job: JobRequest) -> RouteDecision:
     snapshots = list_resources_latest(limit=500)
 
@@ -35,35 +56,52 @@ def route(job: JobRequest) -> RouteDecision:
     if force_type:
         candidates = [t for t in candidates if t.resource_type == force_type]
 
-    considered: List[Dict[str, Any]] = []
-    ok: List[Tuple[TelemetryPoint, Any]] = []
-    bad: List[Tuple[TelemetryPoint, Any]] = []
-
-    for t in candidates:
-        if not _eligible(t, job):
-            continue
-
-        b = score_resource(t, job)
-        considered.append({
+    eligible = [t for t in candidates if _eligible(t, job)]
+    scores = score_resources_batch(eligible, job)
+    n = len(scores)
+
+    # Rank on the raw arrays; pydantic ScoreBreakdowns are materialized
+    # only for the winner and the top-K payload rows.
+    best_ok_i: Optional[int] = None
+    best_bad_i: Optional[int] = None
+    if n:
+        ok_mask = scores.sla_ok
+        if ok_mask.any():
+            best_ok_i = int(np.argmax(np.where(ok_mask, scores.final_score, -np.inf)))
+        if not ok_mask.all():
+            best_bad_i = int(np.argmax(np.where(ok_mask, -np.inf, scores.effective_score)))
+
+    k = min(TOP_K_CONSIDERED, n)
+    if k:
+        top_idx = np.argpartition(-scores.effective_score, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-scores.effective_score[top_idx])]
+    else:
+        top_idx = []
+
+    considered_sorted: List[Dict[str, Any]] = []
+    score_by_id: Dict[str, Dict[str, Any]] = {}
+    for i in top_idx:
+        t = eligible[int(i)]
+        score_dump = scores.materialize(int(i)).model_dump()
+        considered_sorted.append({
             "resource_id": t.resource_id,
             "resource_type": t.resource_type,
-            "score": b.model_dump(),
+            "score": score_dump,
         })
-        (ok if b.sla_ok else bad).append((t, b))
+        score_by_id[t.resource_id] = score_dump
 
-    considered_sorted = sorted(
-        considered,
-        key=lambda x: x["score"].get("effective_score", x["score"]["final_score"]),
-        reverse=True
-    )
+    def _chosen_score(idx: int) -> Dict[str, Any]:
+        t = eligible[idx]
+        return score_by_id.get(t.resource_id) or scores.materialize(idx).model_dump()
 
-    if ok:
-        t, b = max(ok, key=lambda tb: tb[1].final_score)
+    if best_ok_i is not None:
+        t, b = eligible[best_ok_i], scores.materialize(best_ok_i)
         return RouteDecision(
             job_id=job.job_id,
             chosen_resource_id=t.resource_id,
             chosen_resource_type=t.resource_type,
             considered=considered_sorted,
+            chosen_score=_chosen_score(best_ok_i),
             explanation=(
                 f"[SLA OK] Chose {t.resource_id} ({t.resource_type}) score={b.final_score:.3f}. "
                 f"Latency={b.latency_pred_ms:.0f}ms, Cost=${b.cost_pred_usd:.4f}, "
@@ -83,13 +121,14 @@ def route(job: JobRequest) -> RouteDecision:
             ),
         )
 
-    if bad:
-        t, b = max(bad, key=lambda tb: tb[1].effective_score)
+    if best_bad_i is not None:
+        t, b = eligible[best_bad_i], scores.materialize(best_bad_i)
         return RouteDecision(
             job_id=job.job_id,
             chosen_resource_id=t.resource_id,
             chosen_resource_type=t.resource_type,
             considered=considered_sorted,
+            chosen_score=_chosen_score(best_bad_i),
             explanation=(
                 f"[SLA FALLBACK] No SLA-compliant resources. Chose best-available {t.resource_id} ({t.resource_type}) "
                 f"effective_score={b.effective_score:.3f} (raw={b.final_score:.3f}). "
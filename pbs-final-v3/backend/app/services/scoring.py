@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 from typing import Dict, List
-import json
+
+import numpy as np
 
 from ..core.config import load_yaml_config
 from ..models.schemas import TelemetryPoint, JobRequest, ScoreBreakdown
-from .features import build_features
-from .cost_ml import predict_cost
+from .features import build_features_dict
+from .cost_ml import predict_cost, predict_cost_batch
 
-from .normalization import normalize_scores
-from .latency_ml import predict_latency  # ML latency (mean + p90)
+from .normalization import normalize_scores, normalize_scores_batch
+from .latency_ml import predict_latency, predict_latency_batch  # ML latency (mean + p90)
 
 CFG = load_yaml_config()
 
@@ -26,63 +27,185 @@ def _weights() -> Dict[str, float]:
     return {k: v / s for k, v in out.items()}
 
 
-def _features_to_dict(f) -> dict:
-    """Make feature object usable by pandas model inference."""
-    # pydantic v2
-    if hasattr(f, "model_dump"):
-        return f.model_dump()
-    # pydantic v1
-    if hasattr(f, "dict"):
-        return f.dict()
-    # dataclass / plain object
-    try:
-        return dict(vars(f))
-    except Exception:
-        return json.loads(json.dumps(f))
+# Normalized weights are fixed for the process lifetime; resolving them
+# per score_resource call re-walked the config dict every time.
+_WEIGHTS = _weights()
+
+# Component order for the vectorized weighted sum (matches _WEIGHTS keys).
+_W_KEYS = ("latency", "cost", "reliability", "energy")
+_W_VEC = np.array([_WEIGHTS[k] for k in _W_KEYS], dtype=np.float64)
+
 
+def reload_config() -> None:
+    """Re-read config.yaml and rebuild the cached weights (tests / hot reload)."""
+    global CFG, _WEIGHTS, _W_VEC
+    CFG = load_yaml_config()
+    _WEIGHTS = _weights()
+    _W_VEC = np.array([_WEIGHTS[k] for k in _W_KEYS], dtype=np.float64)
 
-def sla_check(job: JobRequest, latency_ms: float, cost_usd: float, reliability: float) -> List[str]:
+
+def sla_check(job: JobRequest, latency_ms: float, cost_usd: float, reliability: float) -> List[tuple]:
+    """Compact (code, predicted, limit) violation tuples.
+
+    The common case is zero violations, so the per-candidate hot path
+    never pays for f-string formatting; callers run format_violations
+    only on the (rare) non-empty lists they actually surface.
+    """
     v = []
     if job.sla.deadline_ms is not None and latency_ms > job.sla.deadline_ms:
-        v.append(f"deadline_ms violated: predicted {latency_ms:.0f} > {job.sla.deadline_ms}")
+        v.append(("deadline_ms", latency_ms, job.sla.deadline_ms))
     if job.sla.max_cost_usd is not None and cost_usd > job.sla.max_cost_usd:
-        v.append(f"max_cost_usd violated: predicted {cost_usd:.4f} > {job.sla.max_cost_usd}")
+        v.append(("max_cost_usd", cost_usd, job.sla.max_cost_usd))
     if job.sla.min_reliability is not None and reliability < job.sla.min_reliability:
-        v.append(f"min_reliability violated: {reliability:.3f} < {job.sla.min_reliability}")
+        v.append(("min_reliability", reliability, job.sla.min_reliability))
     return v
 
 
-def score_resource(t: TelemetryPoint, job: JobRequest) -> ScoreBreakdown:
-    w = _weights()
+def format_violations(codes: List[tuple]) -> List[str]:
+    """Human-readable form of sla_check output (same strings as before)."""
+    out = []
+    for code, value, limit in codes:
+        if code == "deadline_ms":
+            out.append(f"deadline_ms violated: predicted {value:.0f} > {limit}")
+        elif code == "max_cost_usd":
+            out.append(f"max_cost_usd violated: predicted {value:.4f} > {limit}")
+        elif code == "min_reliability":
+            out.append(f"min_reliability violated: {value:.3f} < {limit}")
+        else:
+            out.append(f"{code} violated: {value} vs {limit}")
+    return out
+
+
+class ScoreBreakdownArray:
+    """Structure-of-arrays scoring result with on-demand materialization.
+
+    Scoring N candidates used to build N validated pydantic
+    ScoreBreakdown objects although only the winner and a top-K slice
+    are ever serialized. This holds parallel arrays instead; callers run
+    materialize(i) for the few rows they actually emit.
+    """
+
+    __slots__ = (
+        "latency_pred_ms", "cost_pred_usd", "reliability", "energy_w",
+        "congestion", "normalized", "weighted", "final_score",
+        "effective_score", "sla_ok", "violations",
+    )
 
-    # Build your existing features object (keeps cost predictor compatible)
-    f = build_features(t, job)
-    features_dict = _features_to_dict(f)
+    def __init__(self, **arrays) -> None:
+        for name in self.__slots__:
+            setattr(self, name, arrays[name])
+
+    def __len__(self) -> int:
+        return int(self.final_score.shape[0])
+
+    def materialize(self, i: int) -> ScoreBreakdown:
+        """Build the validated pydantic model for one candidate row."""
+        v = self.violations[i]
+        return ScoreBreakdown(
+            latency_pred_ms=float(self.latency_pred_ms[i]),
+            cost_pred_usd=float(self.cost_pred_usd[i]),
+            reliability=float(self.reliability[i]),
+            energy_w=float(self.energy_w[i]),
+            congestion=float(self.congestion[i]),
+            normalized={k: float(arr[i]) for k, arr in self.normalized.items()},
+            weighted_components={k: float(self.weighted[i, j]) for j, k in enumerate(_W_KEYS)},
+            final_score=float(self.final_score[i]),
+            sla_ok=bool(self.sla_ok[i]),
+            effective_score=float(self.effective_score[i]),
+            sla_violations=format_violations(v) if v else [],
+        )
+
+
+def score_resources_batch(ts: List[TelemetryPoint], job: JobRequest) -> ScoreBreakdownArray:
+    """Score every candidate for one job in a single vectorized pass.
+
+    One predict_latency_batch call replaces N one-row DataFrame predicts,
+    and normalization / weighting run as array ops instead of per-candidate
+    scalar arithmetic. Per-row values match score_resource element-wise;
+    materialize the returned array only for rows that get serialized.
+    """
+    n = len(ts)
+    if n == 0:
+        z = np.empty(0)
+        return ScoreBreakdownArray(
+            latency_pred_ms=z, cost_pred_usd=z, reliability=z, energy_w=z,
+            congestion=z,
+            normalized={k: z for k in ("latency", "cost", "reliability", "energy", "congestion")},
+            weighted=np.empty((0, len(_W_KEYS))),
+            final_score=z, effective_score=z,
+            sla_ok=np.empty(0, dtype=bool), violations=[],
+        )
+
+    feats: List[dict] = [build_features_dict(t, job) for t in ts]
+
+    lat_preds = predict_latency_batch(feats)
+    lat_mean = np.fromiter((lp["mean_ms"] for lp in lat_preds), dtype=np.float64, count=n)
+    lat_p90 = np.fromiter((lp["p90_ms"] for lp in lat_preds), dtype=np.float64, count=n)
+
+    # cost model depends on the injected latency prediction
+    for d, m in zip(feats, lat_mean):
+        d["latency_pred_ms"] = float(m)
+
+    # one batched predict across all candidates, not N one-row predicts
+    cost_preds = predict_cost_batch(feats)
+    cost_mean = np.fromiter((cp["mean_usd"] for cp in cost_preds), dtype=np.float64, count=n)
+    cost_p90 = np.fromiter((cp["p90_usd"] for cp in cost_preds), dtype=np.float64, count=n)
+
+    congestion = np.fromiter((d.get("congestion", 0.0) for d in feats), dtype=np.float64, count=n)
+    reliability = np.fromiter(((t.reliability or 0.98) for t in ts), dtype=np.float64, count=n)
+    energy = np.fromiter(((t.power_w or 50.0) for t in ts), dtype=np.float64, count=n)
 
-    # ✅ REQUIRED: ensure ML pipeline categorical columns exist
-    features_dict.setdefault("job_type", job.job_type)
-    features_dict.setdefault("resource_type", t.resource_type)
+    # ranking uses MEAN
+    norm = normalize_scores_batch(lat_mean, cost_mean, reliability, energy, congestion)
+
+    # (N, 4) component matrix: one BLAS dot replaces four Python
+    # multiplies and three adds per candidate.
+    normed = np.stack([norm[k] for k in _W_KEYS], axis=1)
+    weighted_arr = normed * _W_VEC
+    final = normed @ _W_VEC
+
+    # SLA uses p90; compact codes only — formatting happens at materialize
+    violations = [
+        sla_check(job, float(lat_p90[i]), float(cost_p90[i]), float(reliability[i]))
+        for i in range(n)
+    ]
+    n_viol = np.fromiter((len(v) for v in violations), dtype=np.float64, count=n)
+
+    return ScoreBreakdownArray(
+        latency_pred_ms=lat_mean,
+        cost_pred_usd=cost_mean,
+        reliability=reliability,
+        energy_w=energy,
+        congestion=congestion,
+        normalized=norm,
+        weighted=weighted_arr,
+        final_score=final,
+        effective_score=final - 0.35 * n_viol,
+        sla_ok=n_viol == 0,
+        violations=violations,
+    )
+
+
+def score_resource(t: TelemetryPoint, job: JobRequest) -> ScoreBreakdown:
+    w = _WEIGHTS
+
+    # Single dict build (includes the ML pipeline categorical columns)
+    features_dict = build_features_dict(t, job)
 
     # ML latency prediction (mean + p90)
     lat_pred = predict_latency(features_dict)
     latency_mean_ms = float(lat_pred["mean_ms"])
     latency_p90_ms = float(lat_pred["p90_ms"])  # use ONLY for SLA checks (safer)
-    features_dict["latency_pred_ms"] = latency_mean_ms
-    lat_pred = predict_latency(features_dict)
-    latency_mean_ms = float(lat_pred["mean_ms"])
-    latency_p90_ms  = float(lat_pred["p90_ms"])
-
-    features_dict["latency_pred_ms"] = latency_mean_ms   # <-- RIGHT HERE
 
-    cost_pred = predict_cost(features_dict)
+    # cost model depends on the injected latency prediction
+    features_dict["latency_pred_ms"] = latency_mean_ms
 
-    # Cost stays as your current predictor for now
     cost_pred = predict_cost(features_dict)
     cost_mean_usd = float(cost_pred["mean_usd"])
     cost_p90_usd = float(cost_pred["p90_usd"])
 
 
-    congestion = float(getattr(f, "congestion", features_dict.get("congestion", 0.0)))
+    congestion = float(features_dict.get("congestion", 0.0))
     reliability = float(t.reliability or 0.98)
     energy_w = float(t.power_w or 50.0)
 
@@ -118,6 +241,6 @@ def score_resource(t: TelemetryPoint, job: JobRequest) -> ScoreBreakdown:
         final_score=final,
         sla_ok=sla_ok,
         effective_score=effective,
-        sla_violations=violations,
+        sla_violations=format_violations(violations) if violations else [],
     )
 
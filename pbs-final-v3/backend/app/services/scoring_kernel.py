@@ -0,0 +1,31 @@
+"""Vectorized kernel for the no-model latency fallback.
+
+When the latency artifact is missing, every candidate runs the same
+dense float arithmetic; this module computes it over whole candidate
+arrays at once. numba is not part of the standard deployment, but when
+it happens to be installed the kernel is JIT-compiled for native-speed
+loops; otherwise the plain NumPy version runs unchanged.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+def _fallback_latency(rtt_ms: np.ndarray, payload_mb: np.ndarray,
+                      bw_mbps: np.ndarray, congestion: np.ndarray) -> np.ndarray:
+    # Mirrors latency_ml.predict_latency's fallback formula element-wise.
+    return rtt_ms + 20.0 * payload_mb / np.maximum(1.0, bw_mbps) + 500.0 * congestion
+
+
+try:
+    from numba import njit
+
+    _fallback_latency = njit(cache=True, fastmath=True)(_fallback_latency)
+except ImportError:
+    pass
+
+
+def fallback_latency_means(rtt_ms: np.ndarray, payload_mb: np.ndarray,
+                           bw_mbps: np.ndarray, congestion: np.ndarray) -> np.ndarray:
+    """Mean latency estimates for a candidate batch (no model loaded)."""
+    return _fallback_latency(rtt_ms, payload_mb, bw_mbps, congestion)
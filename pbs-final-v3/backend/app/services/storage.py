@@ -1,8 +1,26 @@
+import atexit
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-import json
+
+try:
+    import orjson
+
+    def _dumps(o: Any) -> str:
+        return orjson.dumps(o).decode()
+
+    _loads = orjson.loads
+except ImportError:  # stdlib fallback keeps storage importable without orjson
+    import json
+
+    def _dumps(o: Any) -> str:
+        return json.dumps(o, ensure_ascii=False)
+
+    _loads = json.loads
 
 from ..core.config import settings
 from ..models.schemas import TelemetryPoint, ResourceSnapshot
@@ -23,6 +41,24 @@ DDL = """CREATE TABLE IF NOT EXISTS telemetry (
   extra_json TEXT
 );
 CREATE INDEX IF NOT EXISTS idx_telemetry_resource_ts ON telemetry(resource_id, ts);
+CREATE INDEX IF NOT EXISTS idx_telemetry_resource_ts_desc ON telemetry(resource_id, ts DESC);
+
+-- Latest point per resource, maintained at ingest time so routing reads
+-- O(#resources) rows regardless of telemetry history size
+CREATE TABLE IF NOT EXISTS resources_latest (
+  resource_id TEXT PRIMARY KEY,
+  ts TEXT NOT NULL,
+  resource_type TEXT NOT NULL,
+  cpu_util REAL,
+  mem_util REAL,
+  gpu_util REAL,
+  net_rtt_ms REAL,
+  net_bw_mbps REAL,
+  price_per_hour_usd REAL,
+  reliability REAL,
+  power_w REAL,
+  extra_json TEXT
+);
 
 -- Job lifecycle (queue + dispatch)
 CREATE TABLE IF NOT EXISTS jobs (
@@ -62,6 +98,8 @@ CREATE TABLE IF NOT EXISTS jobs (
   output_ref TEXT
 );
 CREATE INDEX IF NOT EXISTS idx_jobs_status_updated ON jobs(status, updated_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_sla ON jobs(sla_ok, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_active ON jobs(status) WHERE status IN ('QUEUED','RUNNING');
 
 -- Job events/logs for the UI
 CREATE TABLE IF NOT EXISTS job_events (
@@ -87,10 +125,37 @@ def _conn() -> sqlite3.Connection:
     con.row_factory = sqlite3.Row
     con.execute("PRAGMA journal_mode=WAL;")
     con.execute("PRAGMA synchronous=NORMAL;")
+    con.execute("PRAGMA busy_timeout=5000;")
+    con.execute("PRAGMA wal_autocheckpoint=1000;")
+    con.execute("PRAGMA temp_store=MEMORY;")
+    con.execute("PRAGMA mmap_size=268435456;")
+    con.execute("PRAGMA cache_size=-65536;")
     return con
 
+
+def open_read_connection() -> sqlite3.Connection:
+    """Standalone tuned connection for one-shot scripts (caller closes).
+
+    WAL + busy_timeout let trainers and evaluators read concurrently
+    with the API writer instead of tripping over database-is-locked.
+    """
+    return _conn()
+
+# Single writer connection (WAL: one writer, many readers). Reads go
+# through per-thread connections so concurrent requests do not contend
+# on one connection lock; sqlite3 caches prepared statements per
+# connection, so the repeated SQL strings below stay compiled.
 CONN = _conn()
 
+_TLS = threading.local()
+
+def _read_conn() -> sqlite3.Connection:
+    con = getattr(_TLS, "con", None)
+    if con is None:
+        con = _conn()
+        _TLS.con = con
+    return con
+
 # Apply DDL safely
 for stmt in DDL.strip().split(";"):
     s = stmt.strip()
@@ -126,32 +191,136 @@ def _safe_add_column(table: str, coldef: str) -> None:
 _safe_add_column("jobs", "features_json TEXT")
 _safe_add_column("jobs", "latency_model_version TEXT")
 
-# ---- Telemetry ----
+# Absolute deadline as integer epoch-ms so the SLA monitor compares ints
+# instead of parsing ISO strings per poll; backfilled from created_at.
+_safe_add_column("jobs", "deadline_at_ms INTEGER")
+CONN.execute(
+    """UPDATE jobs
+       SET deadline_at_ms = CAST((julianday(created_at) - 2440587.5) * 86400000 AS INTEGER) + sla_deadline_ms
+       WHERE deadline_at_ms IS NULL AND sla_deadline_ms IS NOT NULL AND created_at IS NOT NULL"""
+)
+CONN.commit()
 
-def insert_point(p: TelemetryPoint) -> None:
+# One-shot backfill of resources_latest from history for DBs created
+# before the snapshot table existed (no-op once populated).
+if CONN.execute("SELECT COUNT(*) AS n FROM resources_latest").fetchone()["n"] == 0:
     CONN.execute(
-        """INSERT INTO telemetry (ts, resource_id, resource_type, cpu_util, mem_util, gpu_util,
-            net_rtt_ms, net_bw_mbps, price_per_hour_usd, reliability, power_w, extra_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
-            p.ts.isoformat(),
-            p.resource_id,
-            p.resource_type,
-            float(p.cpu_util),
-            float(p.mem_util),
-            float(p.gpu_util),
-            float(p.net_rtt_ms),
-            float(p.net_bw_mbps),
-            float(p.price_per_hour_usd),
-            float(p.reliability),
-            float(p.power_w),
-            json.dumps(p.extra, ensure_ascii=False),
-        ),
+        """INSERT INTO resources_latest (resource_id, ts, resource_type, cpu_util, mem_util, gpu_util,
+               net_rtt_ms, net_bw_mbps, price_per_hour_usd, reliability, power_w, extra_json)
+           SELECT resource_id, ts, resource_type, cpu_util, mem_util, gpu_util,
+                  net_rtt_ms, net_bw_mbps, price_per_hour_usd, reliability, power_w, extra_json
+           FROM (
+              SELECT *, ROW_NUMBER() OVER (PARTITION BY resource_id ORDER BY ts DESC) AS rn
+              FROM telemetry
+           )
+           WHERE rn = 1"""
     )
     CONN.commit()
 
+# ---- Telemetry ----
+
+_TELEMETRY_INSERT_SQL = """INSERT INTO telemetry (ts, resource_id, resource_type, cpu_util, mem_util, gpu_util,
+    net_rtt_ms, net_bw_mbps, price_per_hour_usd, reliability, power_w, extra_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+# Same row tuples as the history insert; only replaces when newer so
+# out-of-order batches cannot regress the snapshot.
+_LATEST_UPSERT_SQL = """INSERT INTO resources_latest (ts, resource_id, resource_type, cpu_util, mem_util, gpu_util,
+    net_rtt_ms, net_bw_mbps, price_per_hour_usd, reliability, power_w, extra_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(resource_id) DO UPDATE SET
+      ts=excluded.ts, resource_type=excluded.resource_type, cpu_util=excluded.cpu_util,
+      mem_util=excluded.mem_util, gpu_util=excluded.gpu_util, net_rtt_ms=excluded.net_rtt_ms,
+      net_bw_mbps=excluded.net_bw_mbps, price_per_hour_usd=excluded.price_per_hour_usd,
+      reliability=excluded.reliability, power_w=excluded.power_w, extra_json=excluded.extra_json
+    WHERE excluded.ts >= resources_latest.ts"""
+
+def _telemetry_row(
+    p: TelemetryPoint,
+    price_per_hour_usd: Optional[float] = None,
+    price_source: Optional[str] = None,
+) -> tuple:
+    price = p.price_per_hour_usd if price_per_hour_usd is None else price_per_hour_usd
+    extra = p.extra
+    if price_source is not None:
+        extra = dict(extra)
+        extra["price_source"] = price_source
+    return (
+        p.ts.isoformat(),
+        p.resource_id,
+        p.resource_type,
+        float(p.cpu_util),
+        float(p.mem_util),
+        float(p.gpu_util),
+        float(p.net_rtt_ms),
+        float(p.net_bw_mbps),
+        float(price),
+        float(p.reliability),
+        float(p.power_w),
+        _dumps(extra),
+    )
+
+# Single-point ingest goes through a small write buffer so a burst of
+# points shares one transaction instead of fsyncing the WAL per row.
+_WRITE_BUFFER: List[tuple] = []
+_BUFFER_LOCK = threading.Lock()
+_FLUSH_MAX_ROWS = 100
+_FLUSH_INTERVAL_S = 0.2
+
+def flush_telemetry_buffer() -> int:
+    """Write all buffered telemetry rows in one transaction. Returns row count."""
+    with _BUFFER_LOCK:
+        if not _WRITE_BUFFER:
+            return 0
+        rows = _WRITE_BUFFER[:]
+        _WRITE_BUFFER.clear()
+    with _WRITE_LOCK:
+        CONN.executemany(_TELEMETRY_INSERT_SQL, rows)
+        CONN.executemany(_LATEST_UPSERT_SQL, rows)
+        _commit()
+    return len(rows)
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(_FLUSH_INTERVAL_S)
+        try:
+            flush_telemetry_buffer()
+        except Exception:
+            pass  # keep the flusher alive; rows stay buffered for the next tick
+
+_FLUSHER = threading.Thread(target=_flush_loop, name="telemetry-flush", daemon=True)
+_FLUSHER.start()
+atexit.register(flush_telemetry_buffer)
+
+def insert_point(
+    p: TelemetryPoint,
+    price_per_hour_usd: Optional[float] = None,
+    price_source: Optional[str] = None,
+) -> None:
+    """Buffer one telemetry point; flushed every 100 rows or 200ms.
+
+    Enrichment values (price + its source) can be passed alongside the
+    validated model so callers never have to mutate pydantic instances.
+    """
+    row = _telemetry_row(p, price_per_hour_usd, price_source)
+    with _BUFFER_LOCK:
+        _WRITE_BUFFER.append(row)
+        pending = len(_WRITE_BUFFER)
+    if pending >= _FLUSH_MAX_ROWS:
+        flush_telemetry_buffer()
+
+def insert_points_bulk(points: List[TelemetryPoint]) -> None:
+    """Insert a telemetry batch in one transaction (one commit, not N)."""
+    if not points:
+        return
+    rows = [_telemetry_row(p) for p in points]
+    with _WRITE_LOCK:
+        CONN.executemany(_TELEMETRY_INSERT_SQL, rows)
+        CONN.executemany(_LATEST_UPSERT_SQL, rows)
+        _commit()
+
 def latest_point(resource_id: str) -> Optional[TelemetryPoint]:
-    cur = CONN.execute(
+    cur = _read_conn().execute(
         """SELECT ts, resource_id, resource_type, cpu_util, mem_util, gpu_util, net_rtt_ms, net_bw_mbps,
                   price_per_hour_usd, reliability, power_w, extra_json
            FROM telemetry
@@ -163,7 +332,7 @@ def latest_point(resource_id: str) -> Optional[TelemetryPoint]:
     row = cur.fetchone()
     if not row:
         return None
-    extra = json.loads(row["extra_json"] or "{}")
+    extra = _parse_extra(row["extra_json"])
     return TelemetryPoint(
         ts=datetime.fromisoformat(row["ts"]),
         resource_id=row["resource_id"],
@@ -179,24 +348,26 @@ def latest_point(resource_id: str) -> Optional[TelemetryPoint]:
         extra=extra,
     )
 
+def _parse_extra(raw: Optional[str]) -> Dict[str, Any]:
+    """Parse extra_json, skipping the parser for the common empty case."""
+    if not raw or raw == "{}":
+        return {}
+    return _loads(raw)
+
 def list_resources_latest(limit: int = 100) -> List[ResourceSnapshot]:
-    cur = CONN.execute(
-        """SELECT t1.ts, t1.resource_id, t1.resource_type, t1.cpu_util, t1.mem_util, t1.gpu_util, t1.net_rtt_ms, t1.net_bw_mbps,
-                  t1.price_per_hour_usd, t1.reliability, t1.power_w, t1.extra_json
-           FROM telemetry t1
-           INNER JOIN (
-              SELECT resource_id, MAX(ts) AS max_ts
-              FROM telemetry
-              GROUP BY resource_id
-           ) t2
-           ON t1.resource_id = t2.resource_id AND t1.ts = t2.max_ts
-           ORDER BY t1.resource_type, t1.resource_id
+    # Snapshot table is maintained at ingest time, so this reads one row
+    # per resource instead of scanning telemetry history.
+    cur = _read_conn().execute(
+        """SELECT ts, resource_id, resource_type, cpu_util, mem_util, gpu_util, net_rtt_ms, net_bw_mbps,
+                  price_per_hour_usd, reliability, power_w, extra_json
+           FROM resources_latest
+           ORDER BY resource_type, resource_id
            LIMIT ?""",
         (limit,),
     )
     out: List[ResourceSnapshot] = []
     for row in cur.fetchall():
-        extra = json.loads(row["extra_json"] or "{}")
+        extra = _parse_extra(row["extra_json"])
         p = TelemetryPoint(
             ts=datetime.fromisoformat(row["ts"]),
             resource_id=row["resource_id"],
@@ -217,7 +388,7 @@ def list_resources_latest(limit: int = 100) -> List[ResourceSnapshot]:
 # ---- Pricing cache ----
 
 def get_cached_price(key: str) -> Optional[Dict[str, Any]]:
-    cur = CONN.execute("SELECT price_per_hour_usd, updated_at FROM pricing_cache WHERE key=?", (key,))
+    cur = _read_conn().execute("SELECT price_per_hour_usd, updated_at FROM pricing_cache WHERE key=?", (key,))
     row = cur.fetchone()
     if not row:
         return None
@@ -236,92 +407,258 @@ def set_cached_price(key: str, price_per_hour_usd: float, updated_at: str) -> No
 
 # ---- Jobs + Dispatch Queue ----
 
+# Per-thread flag: inside transaction() the write helpers skip their own
+# commit so a whole attempt's bookkeeping shares one WAL fsync.
+_TXN = threading.local()
+
+# Serializes job-table writes on the shared writer connection. With the
+# worker dispatching from a thread pool, an autocommit write from one
+# thread must not land inside another thread's open transaction();
+# reentrant so helpers called inside transaction() just pass through.
+_WRITE_LOCK = threading.RLock()
+
+def _commit() -> None:
+    if not getattr(_TXN, "active", False):
+        CONN.commit()
+
+@contextmanager
+def transaction():
+    """Group several job-table writes into one BEGIN IMMEDIATE/COMMIT.
+
+    upsert_job / update_job / add_job_event called inside the block defer
+    their commit to the context exit, collapsing the ~6 autocommit fsyncs
+    a worker attempt used to pay into one. Nested blocks join the outer
+    transaction. Only covers writes on this module's writer connection;
+    the attempts module keeps its own connection and commits.
+    """
+    if getattr(_TXN, "active", False):
+        yield
+        return
+    with _WRITE_LOCK:
+        _TXN.active = True
+        CONN.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            CONN.execute("ROLLBACK")
+            raise
+        else:
+            CONN.execute("COMMIT")
+        finally:
+            _TXN.active = False
+
+# Wakes in-process workers the moment a job is queued, so an idle worker
+# thread doesn't eat up to POLL_S of latency on the first claim. Workers
+# in other processes still fall back to their poll timeout.
+_JOB_COND = threading.Condition()
+
+def notify_job_submitted() -> None:
+    with _JOB_COND:
+        _JOB_COND.notify_all()
+
+def wait_for_job(timeout: float) -> None:
+    """Block until a job is submitted in this process, or timeout elapses."""
+    with _JOB_COND:
+        _JOB_COND.wait(timeout)
+
+# SQL text per distinct column shape. Callers hit update_job/upsert_job
+# with a handful of fixed keyword shapes, so rebuilding the statement by
+# string-joining every call is pure waste — and identical SQL text also
+# lets sqlite3's per-connection statement cache reuse the prepared
+# statement instead of re-parsing it.
+_UPSERT_SQL: Dict[tuple, str] = {}
+_UPDATE_SQL: Dict[tuple, str] = {}
+
 def upsert_job(job_row: Dict[str, Any]) -> None:
-    cols = ",".join(job_row.keys())
-    placeholders = ",".join(["?"] * len(job_row))
-    updates = ",".join([f"{k}=excluded.{k}" for k in job_row.keys() if k != "job_id"])
-    CONN.execute(
-        f"INSERT INTO jobs ({cols}) VALUES ({placeholders}) "
-        f"ON CONFLICT(job_id) DO UPDATE SET {updates}",
-        tuple(job_row.values()),
-    )
-    CONN.commit()
+    shape = tuple(job_row.keys())
+    sql = _UPSERT_SQL.get(shape)
+    if sql is None:
+        cols = ",".join(shape)
+        placeholders = ",".join(["?"] * len(shape))
+        updates = ",".join([f"{k}=excluded.{k}" for k in shape if k != "job_id"])
+        sql = (
+            f"INSERT INTO jobs ({cols}) VALUES ({placeholders}) "
+            f"ON CONFLICT(job_id) DO UPDATE SET {updates}"
+        )
+        _UPSERT_SQL[shape] = sql
+    with _WRITE_LOCK:
+        CONN.execute(sql, tuple(job_row.values()))
+        _commit()
+    if job_row.get("status") == "QUEUED":
+        notify_job_submitted()
 
 def update_job(job_id: str, **fields) -> None:
     if not fields:
         return
     fields["updated_at"] = fields.get("updated_at") or datetime.utcnow().isoformat()
-    sets = ", ".join([f"{k}=?" for k in fields.keys()])
+    shape = tuple(fields.keys())
+    sql = _UPDATE_SQL.get(shape)
+    if sql is None:
+        sets = ", ".join([f"{k}=?" for k in shape])
+        sql = f"UPDATE jobs SET {sets} WHERE job_id=?"
+        _UPDATE_SQL[shape] = sql
     vals = list(fields.values()) + [job_id]
-    CONN.execute(f"UPDATE jobs SET {sets} WHERE job_id=?", vals)
-    CONN.commit()
+    with _WRITE_LOCK:
+        CONN.execute(sql, vals)
+        _commit()
 
 def get_job(job_id: str) -> Optional[Dict[str, Any]]:
-    cur = CONN.execute("SELECT * FROM jobs WHERE job_id=?", (job_id,))
+    cur = _read_conn().execute("SELECT * FROM jobs WHERE job_id=?", (job_id,))
     row = cur.fetchone()
     return dict(row) if row else None
 
 def list_jobs(limit: int = 200) -> List[Dict[str, Any]]:
-    cur = CONN.execute("SELECT * FROM jobs ORDER BY updated_at DESC LIMIT ?", (limit,))
+    cur = _read_conn().execute("SELECT * FROM jobs ORDER BY updated_at DESC LIMIT ?", (limit,))
     return [dict(r) for r in cur.fetchall()]
 
-def add_job_event(job_id: str, event: str, message: str = "") -> None:
-    CONN.execute(
-        "INSERT INTO job_events(ts, job_id, event, message) VALUES(?,?,?,?)",
-        (datetime.utcnow().isoformat(), job_id, event, message),
+def list_active_jobs(limit: int = 2000) -> List[Dict[str, Any]]:
+    """QUEUED/RUNNING jobs only, with just the columns the SLA monitor reads.
+
+    The monitor polls every second; filtering in SQL over the partial
+    idx_jobs_active index keeps each poll O(active jobs) instead of
+    deserializing the newest 2000 rows of any status.
+    """
+    cur = _read_conn().execute(
+        """SELECT job_id, status, deadline_at_ms, chosen_resource_id, job_request_json
+           FROM jobs
+           WHERE status IN ('QUEUED','RUNNING')
+           ORDER BY created_at ASC
+           LIMIT ?""",
+        (limit,),
     )
-    CONN.commit()
+    return [dict(r) for r in cur.fetchall()]
+
+_SLA_EVENT_FILTER = """status='BLOCKED'
+              OR (IFNULL(sla_ok, 0)=0 AND IFNULL(sla_violations_json, '[]') NOT IN ('[]', ''))"""
+
+
+def list_sla_event_jobs(limit: int = 200, offset: int = 0) -> List[Dict[str, Any]]:
+    """Jobs that are BLOCKED or carry SLA violations, newest first.
+
+    The filter runs in SQL so /jobs/sla-events only deserializes rows
+    that actually matter instead of scanning the latest 2000 jobs;
+    offset lets callers page through a long history window by window.
+    """
+    cur = _read_conn().execute(
+        f"""SELECT job_id, status, chosen_resource_id, chosen_resource_type,
+                  predicted_latency_ms, predicted_cost_usd, sla_violations_json, updated_at
+           FROM jobs
+           WHERE {_SLA_EVENT_FILTER}
+           ORDER BY updated_at DESC
+           LIMIT ? OFFSET ?""",
+        (limit, offset),
+    )
+    return [dict(r) for r in cur.fetchall()]
+
+
+def count_sla_event_jobs() -> int:
+    """Total rows matching the SLA-event filter, for pagination."""
+    cur = _read_conn().execute(f"SELECT COUNT(*) FROM jobs WHERE {_SLA_EVENT_FILTER}")
+    return int(cur.fetchone()[0])
+
+def add_job_event(job_id: str, event: str, message: str = "") -> None:
+    with _WRITE_LOCK:
+        CONN.execute(
+            "INSERT INTO job_events(ts, job_id, event, message) VALUES(?,?,?,?)",
+            (datetime.utcnow().isoformat(), job_id, event, message),
+        )
+        _commit()
+
+class EventBuffer:
+    """Collect events for one job and flush them in a single INSERT.
+
+    A worker attempt emits several events (RUNNING, FEATURES_CAPTURED,
+    COMPLETED/RETRY); buffering them and writing via executemany costs
+    one statement and one commit instead of one each. flush() composes
+    with transaction(): called inside a block it defers the commit to
+    the block exit. Remaining rows are flushed when the context exits.
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._rows: List[tuple] = []
+
+    def add(self, event: str, message: str = "") -> None:
+        self._rows.append((datetime.utcnow().isoformat(), self.job_id, event, message))
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        with _WRITE_LOCK:
+            CONN.executemany(
+                "INSERT INTO job_events(ts, job_id, event, message) VALUES(?,?,?,?)",
+                rows,
+            )
+            _commit()
+
+    def __enter__(self) -> "EventBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.flush()
+        return False
+
 
 def list_job_events(job_id: str, limit: int = 200) -> List[Dict[str, Any]]:
-    cur = CONN.execute(
+    cur = _read_conn().execute(
         "SELECT ts, job_id, event, message FROM job_events WHERE job_id=? ORDER BY ts DESC LIMIT ?",
         (job_id, limit),
     )
     return [dict(r) for r in cur.fetchall()]
 
-def claim_next_job(worker_id: str) -> Optional[Dict[str, Any]]:
-    """Atomically claim 1 QUEUED job for this worker."""
+def claim_next_jobs(worker_id: str, n: int = 16) -> List[Dict[str, Any]]:
+    """Atomically claim up to n QUEUED jobs for this worker.
+
+    One BEGIN IMMEDIATE / UPDATE ... RETURNING / COMMIT covers the whole
+    batch, so the per-job transaction + WAL fsync cost is amortized over
+    n jobs instead of paid once per claim. Returned rows reflect the
+    post-claim state (status RUNNING, attempts already incremented).
+    """
     now = datetime.utcnow().isoformat()
-    CONN.execute("BEGIN IMMEDIATE")
-    try:
-        cur = CONN.execute(
-            """SELECT * FROM jobs
-               WHERE status='QUEUED'
-                 AND (next_run_at IS NULL OR next_run_at <= ?)
-               ORDER BY created_at ASC
-               LIMIT 1""",
-            (now,),
-        )
-        row = cur.fetchone()
-        if not row:
-            CONN.execute("COMMIT")
-            return None
-
-        job_id = row["job_id"]
-        res = CONN.execute(
-            """UPDATE jobs
-               SET status='RUNNING', worker_id=?, updated_at=?, attempts=attempts+1, next_run_at=NULL
-               WHERE job_id=? AND status='QUEUED'""",
-            (worker_id, now, job_id),
-        )
-        if res.rowcount != 1:
+    with _WRITE_LOCK:
+        CONN.execute("BEGIN IMMEDIATE")
+        try:
+            cur = CONN.execute(
+                """UPDATE jobs
+                   SET status='RUNNING', worker_id=?, updated_at=?, attempts=attempts+1, next_run_at=NULL
+                   WHERE job_id IN (
+                       SELECT job_id FROM jobs
+                       WHERE status='QUEUED'
+                         AND (next_run_at IS NULL OR next_run_at <= ?)
+                       ORDER BY created_at ASC
+                       LIMIT ?)
+                   RETURNING *""",
+                (worker_id, now, now, int(n)),
+            )
+            rows = [dict(r) for r in cur.fetchall()]
             CONN.execute("COMMIT")
-            return None
-        CONN.execute("COMMIT")
-        return dict(row)
-    except Exception:
-        CONN.execute("ROLLBACK")
-        raise
+            return rows
+        except Exception:
+            CONN.execute("ROLLBACK")
+            raise
+
+
+def claim_next_job(worker_id: str) -> Optional[Dict[str, Any]]:
+    """Atomically claim 1 QUEUED job for this worker."""
+    rows = claim_next_jobs(worker_id, n=1)
+    return rows[0] if rows else None
 
 
 def count_jobs(status: str) -> int:
-    cur = CONN.execute("SELECT COUNT(*) AS n FROM jobs WHERE status=?", (status,))
+    cur = _read_conn().execute("SELECT COUNT(*) AS n FROM jobs WHERE status=?", (status,))
     row = cur.fetchone()
     return int(row["n"]) if row else 0
+
+def count_jobs_by_status() -> Dict[str, int]:
+    """All status counts in one query (used by /metrics)."""
+    cur = _read_conn().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+    return {row["status"]: int(row["n"]) for row in cur.fetchall()}
 def set_job_features(job_id: str, features: dict, latency_model_version: str | None = None) -> None:
     now = datetime.utcnow().isoformat()
-    CONN.execute(
-        "UPDATE jobs SET features_json=?, latency_model_version=?, updated_at=? WHERE job_id=?",
-        (json.dumps(features, ensure_ascii=False), latency_model_version, now, job_id),
-    )
-    CONN.commit()
+    with _WRITE_LOCK:
+        CONN.execute(
+            "UPDATE jobs SET features_json=?, latency_model_version=?, updated_at=? WHERE job_id=?",
+            (_dumps(features), latency_model_version, now, job_id),
+        )
+        _commit()
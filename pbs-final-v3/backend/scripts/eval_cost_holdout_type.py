@@ -1,27 +1,40 @@
-import json, sqlite3
+import json
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from sklearn.metrics import mean_absolute_error, r2_score
-from app.core.config import settings
-from app.services.cost_ml import predict_cost
+from app.services.cost_ml import predict_cost_batch, warmup
+from app.services.storage import open_read_connection
 
-con = sqlite3.connect(settings.db_path)
-rows = con.execute("""
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+warmup()  # one joblib load for the whole evaluation
+
+# Stream chunks and parse features_json with orjson; json_normalize
+# builds the columns directly instead of a list-of-dicts detour.
+SQL = """
 SELECT features_json, actual_cost_usd
 FROM jobs
 WHERE status='COMPLETED'
   AND features_json IS NOT NULL
   AND actual_cost_usd IS NOT NULL
-""").fetchall()
-con.close()
+"""
+con = open_read_connection()
+parts = []
+try:
+    for chunk in pd.read_sql_query(SQL, con, chunksize=5000):
+        feats = chunk["features_json"].map(_json_loads)
+        part = pd.json_normalize(feats)
+        part["actual_cost_usd"] = chunk["actual_cost_usd"].to_numpy(dtype=float)
+        parts.append(part)
+finally:
+    con.close()
 
-data=[]
-for fjson, y in rows:
-    d=json.loads(fjson)
-    d["actual_cost_usd"]=float(y)
-    data.append(d)
-
-df=pd.DataFrame(data)
+df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
 if "resource_type" not in df.columns:
     print("resource_type missing in features_json. Fix worker capture first.")
     raise SystemExit()
@@ -29,14 +42,25 @@ if "resource_type" not in df.columns:
 types=df["resource_type"].value_counts().to_dict()
 print("counts_by_type:", types)
 
-# Evaluate separately per type
-for rt in sorted(df["resource_type"].unique()):
-    sub=df[df["resource_type"]==rt].copy()
-    y_true=sub["actual_cost_usd"].values
-    preds=[]
-    for _,row in sub.iterrows():
-        d=row.drop(labels=["actual_cost_usd"]).to_dict()
-        p=predict_cost(d)
-        preds.append(float(p["mean_usd"]))
-    y_pred=np.array(preds)
-    print(rt, "n=", len(sub), "MAE=", mean_absolute_error(y_true,y_pred), "R2=", r2_score(y_true,y_pred))
+# Evaluate separately per type: one batched predict per group instead of
+# re-entering the pipeline once per row via iterrows(). Groups run
+# concurrently under joblib so the per-type work overlaps across cores.
+def _eval_type(rt, sub):
+    y_true = sub["actual_cost_usd"].values
+    feats_df = sub.drop(columns=["actual_cost_usd"]).reset_index(drop=True)
+    # Fixed-rate telemetry repeats near-identical rows; hash each row
+    # (floats rounded to 3 decimals), predict once per unique row and
+    # broadcast back through the factorized codes.
+    key = pd.util.hash_pandas_object(feats_df.round(3), index=False)
+    codes, _ = pd.factorize(key)
+    unique_mask = ~pd.Series(codes).duplicated().to_numpy()
+    uniq = feats_df[unique_mask].to_dict(orient="records")
+    preds = np.array([float(p["mean_usd"]) for p in predict_cost_batch(uniq)])
+    y_pred = preds[codes]
+    return rt, len(sub), mean_absolute_error(y_true, y_pred), r2_score(y_true, y_pred)
+
+results = Parallel(n_jobs=-1)(
+    delayed(_eval_type)(rt, sub) for rt, sub in df.groupby("resource_type", sort=True)
+)
+for rt, n, mae, r2 in results:
+    print(rt, "n=", n, "MAE=", mae, "R2=", r2)
@@ -39,12 +39,15 @@ CREATE INDEX IF NOT EXISTS idx_job_attempts_started ON job_attempts(started_at);
 """
 
 con = sqlite3.connect(settings.db_path)
-for stmt in DDL.strip().split(";"):
-    s = stmt.strip()
-    if s:
-        con.execute(s)
-con.commit()
+con.execute("PRAGMA journal_mode=WAL;")
+con.execute("PRAGMA synchronous=NORMAL;")
+con.execute("PRAGMA temp_store=memory;")
+con.execute("PRAGMA cache_size=-20000;")
+
+# executescript runs the whole DDL in one transaction (one fsync) and
+# skips the Python-side statement splitting.
+con.executescript("BEGIN IMMEDIATE;\n" + DDL + "\nCOMMIT;")
 
 row = con.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='job_attempts'").fetchone()
 print("created job_attempts:", row)
-con.close()
+con.close()
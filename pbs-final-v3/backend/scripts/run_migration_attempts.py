@@ -13,8 +13,11 @@ def main():
 
     con = sqlite3.connect(settings.db_path)
     try:
-        con.executescript(sql)
-        con.commit()
+        con.execute("PRAGMA journal_mode=WAL;")
+        con.execute("PRAGMA synchronous=NORMAL;")
+        con.execute("PRAGMA temp_store=memory;")
+        con.execute("PRAGMA cache_size=-20000;")
+        con.executescript("BEGIN IMMEDIATE;\n" + sql + "\nCOMMIT;")
     finally:
         con.close()
 
@@ -1,11 +1,21 @@
 import argparse
-import random
+import asyncio
 import time
 from datetime import datetime
-import requests
+import numpy as np
+import httpx
 
-def clamp01(x):
-    return max(0.0, min(1.0, x))
+# Per-type base tables indexed by a small int code (edge=0, cloud=1,
+# gpu=2) so the per-tick generator never does per-point dict lookups.
+TYPE_CODES = {"edge": 0, "cloud": 1, "gpu": 2}
+BASE_RTT = np.array([20.0, 80.0, 60.0])
+BASE_BW = np.array([80.0, 120.0, 120.0])
+PRICE_LO = np.array([0.0, 0.05, 0.40])
+PRICE_HI = np.array([0.0, 0.20, 1.20])
+REL_LO = np.array([0.93, 0.97, 0.96])
+REL_HI = np.array([0.98, 0.995, 0.992])
+POWER_LO = np.array([15.0, 80.0, 180.0])
+POWER_HI = np.array([60.0, 200.0, 350.0])
 
 def make_resource_set():
     resources = []
@@ -17,62 +27,93 @@ def make_resource_set():
         resources.append(("gpu", f"gpu-{i+1}"))
     return resources
 
-def step_point(rtype, rid):
-    base_rtt = {"edge": 20, "cloud": 80, "gpu": 60}[rtype]
-    price = {"edge": 0.0, "cloud": random.uniform(0.05, 0.20), "gpu": random.uniform(0.40, 1.20)}[rtype]
-    reliability = {"edge": random.uniform(0.93, 0.98), "cloud": random.uniform(0.97, 0.995), "gpu": random.uniform(0.96, 0.992)}[rtype]
-    power = {"edge": random.uniform(15, 60), "cloud": random.uniform(80, 200), "gpu": random.uniform(180, 350)}[rtype]
+def step_points(rng, resources, codes):
+    """Generate one tick of points for every resource in vectorized numpy calls.
 
-    cpu = clamp01(random.gauss(0.45, 0.20))
-    mem = clamp01(random.gauss(0.50, 0.18))
-    gpu = clamp01(random.gauss(0.55, 0.25)) if rtype == "gpu" else 0.0
+    Same distributions as the old per-resource step_point, but each RNG
+    draw covers the whole resource set at once instead of ~10 scalar
+    random.* calls per point.
+    """
+    n = len(resources)
+    c = codes
+    price = PRICE_LO[c] + (PRICE_HI[c] - PRICE_LO[c]) * rng.random(n)
+    reliability = REL_LO[c] + (REL_HI[c] - REL_LO[c]) * rng.random(n)
+    power = POWER_LO[c] + (POWER_HI[c] - POWER_LO[c]) * rng.random(n)
 
-    if random.random() < 0.08:
-        cpu = clamp01(cpu + random.uniform(0.25, 0.45))
-        mem = clamp01(mem + random.uniform(0.20, 0.40))
-        if rtype == "gpu":
-            gpu = clamp01(gpu + random.uniform(0.30, 0.55))
+    cpu = np.clip(rng.normal(0.45, 0.20, n), 0.0, 1.0)
+    mem = np.clip(rng.normal(0.50, 0.18, n), 0.0, 1.0)
+    is_gpu = c == TYPE_CODES["gpu"]
+    gpu = np.where(is_gpu, np.clip(rng.normal(0.55, 0.25, n), 0.0, 1.0), 0.0)
 
-    rtt = max(1.0, random.gauss(base_rtt, base_rtt * 0.25))
-    bw = max(5.0, random.gauss(120 if rtype != "edge" else 80, 25))
+    spike = rng.random(n) < 0.08
+    cpu = np.clip(cpu + spike * rng.uniform(0.25, 0.45, n), 0.0, 1.0)
+    mem = np.clip(mem + spike * rng.uniform(0.20, 0.40, n), 0.0, 1.0)
+    gpu = np.clip(gpu + (spike & is_gpu) * rng.uniform(0.30, 0.55, n), 0.0, 1.0)
 
-    return {
-        "ts": datetime.utcnow().isoformat(),
-        "resource_id": rid,
-        "resource_type": rtype,
-        "cpu_util": cpu,
-        "mem_util": mem,
-        "gpu_util": gpu,
-        "net_rtt_ms": rtt,
-        "net_bw_mbps": bw,
-        "price_per_hour_usd": price,
-        "reliability": reliability,
-        "power_w": power,
-        "extra": {"demo": True},
-    }
+    rtt = np.maximum(1.0, rng.normal(BASE_RTT[c], BASE_RTT[c] * 0.25))
+    bw = np.maximum(5.0, rng.normal(BASE_BW[c], 25.0))
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--url", default="http://127.0.0.1:8000/telemetry")
-    ap.add_argument("--seconds", type=int, default=60)
-    ap.add_argument("--hz", type=float, default=2.0)
-    args = ap.parse_args()
+    ts = datetime.utcnow().isoformat()
+    return [
+        {
+            "ts": ts,
+            "resource_id": rid,
+            "resource_type": rtype,
+            "cpu_util": float(cpu[i]),
+            "mem_util": float(mem[i]),
+            "gpu_util": float(gpu[i]),
+            "net_rtt_ms": float(rtt[i]),
+            "net_bw_mbps": float(bw[i]),
+            "price_per_hour_usd": float(price[i]),
+            "reliability": float(reliability[i]),
+            "power_w": float(power[i]),
+            "extra": {"demo": True},
+        }
+        for i, (rtype, rid) in enumerate(resources)
+    ]
 
+async def _run(args):
     resources = make_resource_set()
+    codes = np.array([TYPE_CODES[rtype] for rtype, _ in resources])
+    rng = np.random.default_rng()
     end = time.time() + args.seconds
     period = 1.0 / max(0.1, args.hz)
 
-    print(f"Sending telemetry to {args.url} for {args.seconds}s ...")
-    while time.time() < end:
-        for rtype, rid in resources:
-            p = step_point(rtype, rid)
-            try:
-                requests.post(args.url, json=p, timeout=2.0)
-            except Exception as e:
-                print("telemetry send failed:", e)
-        time.sleep(period)
+    # One POST per tick against /telemetry/batch: the server inserts the
+    # whole list in a single transaction instead of one per resource.
+    batch_url = args.url.rstrip("/") + "/batch"
+
+    async def _post(client, points):
+        try:
+            await client.post(batch_url, json={"points": points}, timeout=2.0)
+        except Exception as e:
+            print("telemetry send failed:", e)
+
+    # One keep-alive async client for the whole run; each tick's POST is
+    # fired as a task so a stalled request overlaps the pacing sleep
+    # instead of delaying the next tick.
+    limits = httpx.Limits(max_keepalive_connections=16)
+    async with httpx.AsyncClient(limits=limits) as client:
+        print(f"Sending telemetry to {batch_url} for {args.seconds}s ...")
+        pending = set()
+        while time.time() < end:
+            points = step_points(rng, resources, codes)
+            task = asyncio.create_task(_post(client, points))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            await asyncio.sleep(period)
+        if pending:
+            await asyncio.gather(*pending)
 
     print("done")
 
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", default="http://127.0.0.1:8000/telemetry")
+    ap.add_argument("--seconds", type=int, default=60)
+    ap.add_argument("--hz", type=float, default=2.0)
+    args = ap.parse_args()
+    asyncio.run(_run(args))
+
 if __name__ == "__main__":
     main()
@@ -9,9 +9,8 @@ import joblib
 from sklearn.model_selection import train_test_split, RandomizedSearchCV
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.impute import SimpleImputer
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import OrdinalEncoder
+from sklearn.ensemble import HistGradientBoostingRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 
 # allow imports from backend/app
@@ -19,7 +18,20 @@ BACKEND_DIR = Path(__file__).resolve().parents[1]
 sys.path.append(str(BACKEND_DIR))
 
 from app.core.config import settings
-import sqlite3
+from app.services.storage import open_read_connection
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _loads_or_none(s):
+    try:
+        return _json_loads(s)
+    except Exception:
+        return None
 
 MODEL_DIR = BACKEND_DIR / "models"
 MODEL_DIR.mkdir(parents=True, exist_ok=True)
@@ -34,26 +46,35 @@ def mape(y_true, y_pred) -> float:
     return float(np.mean(np.abs((y_true - y_pred) / denom)) * 100.0)
 
 def load_real_rows(min_rows: int = 50):
-    con = sqlite3.connect(settings.db_path, check_same_thread=False)
-    cur = con.execute("""
+    # Stream chunks and parse features_json with orjson; json_normalize
+    # builds the feature columns directly instead of json.loads +
+    # list-append per row.
+    sql = """
         SELECT features_json, actual_latency_ms
         FROM jobs
         WHERE status='COMPLETED'
           AND actual_latency_ms IS NOT NULL
           AND features_json IS NOT NULL
-    """)
-    rows = cur.fetchall()
-    con.close()
-
-    feats, ys = [], []
-    for fjson, y in rows:
-        try:
-            feats.append(json.loads(fjson))
-            ys.append(float(y))
-        except Exception:
-            continue
-
-    return feats, ys
+    """
+    con = open_read_connection()
+    parts = []
+    try:
+        for chunk in pd.read_sql_query(sql, con, chunksize=5000):
+            feats = chunk["features_json"].map(_loads_or_none)
+            ok = feats.notna()
+            if not ok.any():
+                continue
+            part = pd.json_normalize(feats[ok])
+            part["__y_ms"] = chunk.loc[ok, "actual_latency_ms"].to_numpy(dtype=float)
+            parts.append(part)
+    finally:
+        con.close()
+
+    if not parts:
+        return pd.DataFrame(), np.empty(0, dtype=float)
+    df = pd.concat(parts, ignore_index=True)
+    ys = df.pop("__y_ms").to_numpy(dtype=float)
+    return df, ys
 
 def generate_synthetic(n: int = 4000):
     # synthetic generator that looks realistic enough for demo + tuning
@@ -120,54 +141,55 @@ def generate_synthetic(n: int = 4000):
     return feats, ys
 
 def main():
-    real_X, real_y = load_real_rows(min_rows=50)
+    real_df, real_y = load_real_rows(min_rows=50)
 
     # mix real + synthetic (best for “impressive” demo)
     syn_X, syn_y = generate_synthetic(n=5000)
-    X = real_X + syn_X
-    y = real_y + syn_y
-
-    df = pd.DataFrame(X)
-    target = np.array(y, dtype=float)
+    syn_df = pd.json_normalize(syn_X)
+    df = pd.concat([real_df, syn_df], ignore_index=True) if len(real_df) else syn_df
+    target = np.concatenate([np.asarray(real_y, dtype=float), np.asarray(syn_y, dtype=float)])
 
     cat_cols = ["job_type", "resource_type"]
     num_cols = [c for c in df.columns if c not in cat_cols]
+    # float32 numerics halve the bytes the fit has to move; plenty of
+    # precision for tree splits
+    df[num_cols] = df[num_cols].astype(np.float32)
 
+    # Ordinal codes + native categorical splits in the booster; no
+    # one-hot column blow-up, and HGB handles NaN in numerics natively
+    # so the imputers go away too.
     pre = ColumnTransformer(
         transformers=[
-            ("num", Pipeline(steps=[
-                ("imputer", SimpleImputer(strategy="median")),
-            ]), num_cols),
-            ("cat", Pipeline(steps=[
-                ("imputer", SimpleImputer(strategy="most_frequent")),
-                ("ohe", OneHotEncoder(handle_unknown="ignore")),
-            ]), cat_cols),
+            ("cat", OrdinalEncoder(handle_unknown="use_encoded_value", unknown_value=-1), cat_cols),
+            ("num", "passthrough", num_cols),
         ]
     )
 
-    model = RandomForestRegressor(
-        n_estimators=400,
+    model = HistGradientBoostingRegressor(
+        max_iter=400,
+        learning_rate=0.05,
+        max_leaf_nodes=63,
+        categorical_features=list(range(len(cat_cols))),
+        early_stopping=True,
         random_state=42,
-        n_jobs=-1
     )
 
-    pipe = Pipeline(steps=[("pre", pre), ("rf", model)])
+    pipe = Pipeline(steps=[("pre", pre), ("hgb", model)])
 
     # split: train / calib / test (calib used for conformal q90)
     X_train, X_tmp, y_train, y_tmp = train_test_split(df, target, test_size=0.30, random_state=42)
     X_cal, X_test, y_cal, y_test = train_test_split(X_tmp, y_tmp, test_size=0.50, random_state=42)
 
-    # hyperparameter search (small but meaningful)
+    # hyperparameter search (small; early stopping keeps each fit cheap)
     params = {
-        "rf__max_depth": [8, 12, 18, None],
-        "rf__min_samples_split": [2, 5, 10],
-        "rf__min_samples_leaf": [1, 2, 4],
-        "rf__max_features": ["sqrt", 0.6, 0.9],
+        "hgb__learning_rate": [0.03, 0.05, 0.1],
+        "hgb__max_leaf_nodes": [31, 63],
+        "hgb__min_samples_leaf": [10, 20, 40],
     }
     search = RandomizedSearchCV(
         pipe,
         params,
-        n_iter=18,
+        n_iter=6,
         scoring="neg_mean_absolute_error",
         cv=3,
         random_state=42,
@@ -181,7 +203,7 @@ def main():
     # evaluate
     pred_test = best.predict(X_test)
     metrics = {
-        "model_version": "rf_latency_v1",
+        "model_version": "hgb_latency_v1",
         "trained_at_utc": datetime.utcnow().isoformat(),
         "n_real_rows": len(real_y),
         "n_synthetic_rows": len(syn_y),
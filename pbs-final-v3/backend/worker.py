@@ -12,24 +12,31 @@ PBS Dispatch Worker (Layer 6 + Layer 7)
 
 from __future__ import annotations
 
+import hashlib
 import os
 import time
 import uuid
-import json
+import orjson
 import traceback
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 
 from app.services.storage import (
-    claim_next_job,
+    EventBuffer,
+    claim_next_jobs,
     update_job,
     add_job_event,
-    get_job,
     latest_point,
+    transaction,
+    wait_for_job,
 )
+from pydantic import TypeAdapter
+
 from app.services.dispatcher import dispatch
-from app.models.schemas import JobRequest
+from app.models.schemas import SLA, JobRequest
 from app.services.features import build_features
-from app.ml.feature_codec import to_dict
+from app.ml.feature_codec import to_json_bytes
 from app.services.routing import route
 
 from app.services.attempts import (
@@ -43,23 +50,110 @@ from app.services.attempts import (
 POLL_S = float(os.getenv("WORKER_POLL_S", "1.0"))
 WORKER_ID = os.getenv("WORKER_ID", str(uuid.uuid4())[:8])
 REROUTE_ON_RETRY = os.getenv("REROUTE_ON_RETRY", "1") == "1"
+BATCH_N = int(os.getenv("WORKER_BATCH_N", "16"))
+CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "4"))
+TRUST_JOB_JSON = os.getenv("TRUST_JOB_JSON", "0") == "1"
+
+_JR_ADAPTER = TypeAdapter(JobRequest)
+
+
+def _parse_job_request(jr: str) -> JobRequest:
+    """Parse job_request_json that this service serialized itself.
+
+    The module-level TypeAdapter avoids rebuilding the validation schema
+    per call. With TRUST_JOB_JSON=1 validation is skipped outright:
+    orjson parses the dict and model_construct assembles the instances
+    (nested SLA included) — acceptable only because the JSON was dumped
+    from an already-validated model at submit time.
+    """
+    if TRUST_JOB_JSON:
+        d = orjson.loads(jr)
+        sla = d.get("sla")
+        if isinstance(sla, dict):
+            d["sla"] = SLA.model_construct(**sla)
+        return JobRequest.model_construct(**d)
+    return _JR_ADAPTER.validate_json(jr)
+
+
+# Serialized features keyed by (request json, resource, telemetry tick):
+# a retried/rerouted attempt with unchanged inputs reuses the JSON string
+# instead of rebuilding and re-encoding the identical dict. The telemetry
+# timestamp in the key makes stale entries unreachable, so no explicit
+# invalidation is needed.
+_FEATS_CACHE: OrderedDict = OrderedDict()
+_FEATS_CACHE_MAX = 4096
+
+
+def _feats_json_for(jr: str, job_req: JobRequest, tel) -> str:
+    key = (jr, tel.resource_id, tel.ts)
+    cached = _FEATS_CACHE.get(key)
+    if cached is not None:
+        _FEATS_CACHE.move_to_end(key)
+        return cached
+
+    # codec emits the final dict (categorical + SLA keys included) and
+    # serializes it in one pass
+    feats_json = to_json_bytes(build_features(tel, job_req), job_req, tel).decode()
+    _FEATS_CACHE[key] = feats_json
+    if len(_FEATS_CACHE) > _FEATS_CACHE_MAX:
+        _FEATS_CACHE.popitem(last=False)
+    return feats_json
+
+
+# Reroute decisions are pure given the request shape and the current
+# telemetry; a short TTL bounds telemetry staleness while letting
+# repeated failures and sibling jobs with the same shape share one full
+# scoring pass. Plain dict instead of cachetools to avoid a dependency.
+_ROUTE_CACHE: dict = {}
+_ROUTE_TTL_S = 0.5
+_ROUTE_CACHE_MAX = 1024
+
+
+def _route_cached(job_req: JobRequest):
+    payload = job_req.model_dump(mode="json", exclude={"job_id"})
+    ex = (payload.get("hints") or {}).get("exclude_resource_ids")
+    if ex:
+        payload["hints"]["exclude_resource_ids"] = sorted(ex)
+    key = hashlib.blake2b(
+        orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).digest()
+
+    now = time.monotonic()
+    hit = _ROUTE_CACHE.get(key)
+    if hit is not None and now - hit[0] < _ROUTE_TTL_S:
+        return hit[1]
+
+    decision = route(job_req)
+    if len(_ROUTE_CACHE) >= _ROUTE_CACHE_MAX:
+        _ROUTE_CACHE.clear()
+    _ROUTE_CACHE[key] = (now, decision)
+    return decision
+
+
+# Backoff delays are a tiny fixed set (2^n capped at 60s); precomputing
+# the timedeltas leaves only the utcnow + isoformat per retry.
+_BACKOFF_TD = tuple(timedelta(seconds=min(60, 2 ** max(1, a))) for a in range(16))
 
 
 def _backoff_iso(attempts: int) -> str:
-    delay = min(60, 2 ** max(1, attempts))
-    return (datetime.utcnow() + timedelta(seconds=delay)).isoformat()
+    return (datetime.utcnow() + _BACKOFF_TD[min(attempts, 15)]).isoformat()
 
 
-def _reroute_job(latest: dict, attempt_id: str) -> bool:
+def _reroute_job(latest: dict, attempt_id: str, job_req: JobRequest | None = None) -> bool:
     """
     Reroute a job to a different resource after failure.
     Writes reroute info to both job_events and job_attempts.
+
+    The caller passes the JobRequest it already parsed at claim time;
+    re-validating the same JSON here doubled the pydantic cost of every
+    failed attempt.
     """
     try:
-        jr = latest.get("job_request_json")
-        if not jr:
-            return False
-        job_req = JobRequest.model_validate_json(jr)
+        if job_req is None:
+            jr = latest.get("job_request_json")
+            if not jr:
+                return False
+            job_req = _parse_job_request(jr)
 
         hints = dict(job_req.hints or {})
         ex = list(hints.get("exclude_resource_ids") or [])
@@ -67,19 +161,17 @@ def _reroute_job(latest: dict, attempt_id: str) -> bool:
         if cur and cur != "none":
             ex.append(cur)
         hints["exclude_resource_ids"] = list(dict.fromkeys(ex))
-        job_req.hints = hints
+        # JobRequest is frozen; derive the rerouted request instead of
+        # mutating the instance shared with the rest of the attempt
+        job_req = job_req.model_copy(update={"hints": hints})
 
-        decision = route(job_req)
+        decision = _route_cached(job_req)
         if decision.chosen_resource_id == "none":
             add_job_event(latest["job_id"], "REROUTE_FAILED", "No alternative resource found")
             return False
 
         # update job row with new chosen resource + predicted scores
-        chosen_score = None
-        for item in decision.considered:
-            if item["resource_id"] == decision.chosen_resource_id:
-                chosen_score = item["score"]
-                break
+        chosen_score = decision.chosen_score
 
         update_job(
             latest["job_id"],
@@ -89,7 +181,7 @@ def _reroute_job(latest: dict, attempt_id: str) -> bool:
             predicted_cost_usd=float(chosen_score["cost_pred_usd"]) if chosen_score else None,
             final_score=float(chosen_score["final_score"]) if chosen_score else None,
             sla_ok=int(chosen_score["sla_ok"]) if chosen_score else 0,
-            sla_violations_json=json.dumps(chosen_score.get("sla_violations", []) if chosen_score else []),
+            sla_violations_json=orjson.dumps(chosen_score.get("sla_violations", []) if chosen_score else []).decode(),
         )
 
         add_job_event(
@@ -107,114 +199,147 @@ def _reroute_job(latest: dict, attempt_id: str) -> bool:
         return False
 
 
+def _run_job(job: dict) -> None:
+    """Process one claimed job: features, dispatch, finalize/retry."""
+    job_id = job["job_id"]
+    # the claim UPDATE ... RETURNING already handed back the current row
+    # (RUNNING, attempts incremented); refetching it was a SELECT per job.
+    # No CANCELLED check needed: the claim only matches status='QUEUED'
+    # inside BEGIN IMMEDIATE, so a cancelled job can never be handed out.
+    latest = job
+
+    # create attempt row NOW (attempt_no already incremented by the claim)
+    attempt_id = create_attempt(latest)
+
+    # events for this attempt are buffered and written in one INSERT
+    with EventBuffer(job_id) as ev:
+        _run_attempt(latest, attempt_id, ev)
+
+
+def _run_attempt(latest: dict, attempt_id: str, ev: EventBuffer) -> None:
+    job_id = latest["job_id"]
+    ev.add("RUNNING", f"claimed by worker_id={WORKER_ID} attempts={latest.get('attempts')}")
+
+    # Parse the job request once per claim; dispatch() and the
+    # adapters reuse the parsed object instead of re-validating
+    # the same JSON on every hop.
+    job_req = None
+    try:
+        jr = latest.get("job_request_json")
+        if jr:
+            job_req = _parse_job_request(jr)
+    except Exception:
+        job_req = None
+    latest["_job_request"] = job_req
+
+    tel = None
+    try:
+        rid = latest.get("chosen_resource_id")
+        if rid and rid != "none":
+            tel = latest_point(rid)
+    except Exception:
+        tel = None
+
+    if job_req and tel:
+        feats_json = _feats_json_for(latest.get("job_request_json") or "", job_req, tel)
+        update_job(job_id, features_json=feats_json)
+        update_attempt_features(attempt_id, feats_json)
+        ev.add("FEATURES_CAPTURED", "Saved features_json for ML training")
+    else:
+        ev.add("FEATURES_SKIPPED", "Missing job_request_json or telemetry")
+
+    try:
+        res = dispatch(latest)
+
+        # one commit finalizes status + this attempt's buffered events
+        with transaction():
+            update_job(
+                job_id,
+                status="COMPLETED",
+                actual_latency_ms=float(res.actual_latency_ms),
+                actual_cost_usd=float(res.actual_cost_usd),
+                output_ref=res.output_ref,
+                worker_id=WORKER_ID,
+            )
+            ev.add("COMPLETED", f"latency_ms={res.actual_latency_ms} cost_usd={res.actual_cost_usd} output={res.output_ref}")
+            ev.flush()
+
+        finish_attempt_success(
+            attempt_id,
+            actual_latency_ms=float(res.actual_latency_ms),
+            actual_cost_usd=float(res.actual_cost_usd),
+            output_ref=res.output_ref,
+        )
+
+    except Exception as e:
+        # one bounded format, reused for both the attempt row and the
+        # FAILED event; deep frames and unbounded sizes are log noise
+        tb = traceback.format_exc(limit=20)[:8192]
+
+        finish_attempt_failure(
+            attempt_id,
+            error_class=type(e).__name__,
+            error_message=str(e),
+            traceback_str=tb,
+        )
+
+        # the claim already returned the post-increment row, so attempts
+        # and max_attempts are known without another SELECT here
+        attempts = int(latest.get("attempts") or 1)
+        max_attempts = int(latest.get("max_attempts") or 2)
+
+        # reroute before retry
+        if REROUTE_ON_RETRY and attempts < max_attempts:
+            _reroute_job(latest, attempt_id, job_req)
+
+        with transaction():
+            if attempts < max_attempts:
+                nr = _backoff_iso(attempts)
+                update_job(job_id, status="QUEUED", next_run_at=nr, worker_id=None)
+                ev.add("RETRY", f"{e} | next_run_at={nr}")
+            else:
+                update_job(job_id, status="FAILED", worker_id=WORKER_ID)
+                ev.add("FAILED", tb)
+            ev.flush()
+
+
 def main():
-    print(f"[worker] started worker_id={WORKER_ID} poll={POLL_S}s reroute={REROUTE_ON_RETRY}")
+    print(f"[worker] started worker_id={WORKER_ID} poll={POLL_S}s batch={BATCH_N} "
+          f"concurrency={CONCURRENCY} reroute={REROUTE_ON_RETRY}")
+    # dispatch() is I/O-bound, so one claim transaction can feed several
+    # concurrent attempts; DB writes stay safe behind storage's writer
+    # lock and the attempts module's per-thread connections.
+    executor = ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix="dispatch")
+    # Keep CONCURRENCY jobs in flight continuously instead of joining a
+    # whole batch at once: one slow dispatch no longer stalls the claim
+    # loop, so fresh jobs backfill freed slots as soon as any attempt
+    # finishes.
+    in_flight: set = set()
     while True:
         try:
-            job = claim_next_job(WORKER_ID)
-            if not job:
-                time.sleep(POLL_S)
-                continue
-
-            job_id = job["job_id"]
-            latest = get_job(job_id) or job
-
-            if latest.get("status") == "CANCELLED":
-                add_job_event(job_id, "SKIPPED", "Job was cancelled before dispatch")
-                continue
-
-            # create attempt row NOW (attempt_no already incremented by claim_next_job)
-            attempt_id = create_attempt(latest)
-
-            add_job_event(job_id, "RUNNING", f"claimed by worker_id={WORKER_ID} attempts={latest.get('attempts')}")
-
-            # capture features for ML training
-            job_req = None
-            try:
-                jr = latest.get("job_request_json")
-                if jr:
-                    job_req = JobRequest.model_validate_json(jr)
-            except Exception:
-                job_req = None
-
-            tel = None
-            try:
-                rid = latest.get("chosen_resource_id")
-                if rid and rid != "none":
-                    tel = latest_point(rid)
-            except Exception:
-                tel = None
-
-            if job_req and tel:
-                f = build_features(tel, job_req)
-                feats = to_dict(f)
-                # Force categorical + routing-critical fields into features_json
-                feats["job_type"] = job_req.job_type
-                feats["resource_type"] = tel.resource_type
-                feats["requires_gpu"] = bool(job_req.requires_gpu)
-                feats["allow_sla_fallback"] = bool(job_req.allow_sla_fallback)
-
-                # Optional but useful for learning SLA behavior later
-                if job_req.sla:
-                    feats["sla_deadline_ms"] = job_req.sla.deadline_ms
-                    feats["sla_max_cost_usd"] = job_req.sla.max_cost_usd
-                    feats["sla_min_reliability"] = job_req.sla.min_reliability
-
-                feats_json = json.dumps(feats, ensure_ascii=False)
-
-                update_job(job_id, features_json=feats_json)
-                update_attempt_features(attempt_id, feats_json)
-
-                add_job_event(job_id, "FEATURES_CAPTURED", "Saved features_json for ML training")
-            else:
-                add_job_event(job_id, "FEATURES_SKIPPED", "Missing job_request_json or telemetry")
-
-            try:
-                res = dispatch(latest)
-
-                update_job(
-                    job_id,
-                    status="COMPLETED",
-                    actual_latency_ms=float(res.actual_latency_ms),
-                    actual_cost_usd=float(res.actual_cost_usd),
-                    output_ref=res.output_ref,
-                    worker_id=WORKER_ID,
-                )
-
-                finish_attempt_success(
-                    attempt_id,
-                    actual_latency_ms=float(res.actual_latency_ms),
-                    actual_cost_usd=float(res.actual_cost_usd),
-                    output_ref=res.output_ref,
-                )
-
-                add_job_event(job_id, "COMPLETED", f"latency_ms={res.actual_latency_ms} cost_usd={res.actual_cost_usd} output={res.output_ref}")
-
-            except Exception as e:
-                tb = traceback.format_exc()
-
-                finish_attempt_failure(
-                    attempt_id,
-                    error_class=type(e).__name__,
-                    error_message=str(e),
-                    traceback_str=tb,
-                )
-
-                latest2 = get_job(job_id) or latest
-                attempts = int(latest2.get("attempts") or 1)
-                max_attempts = int(latest2.get("max_attempts") or 2)
-
-                # reroute before retry
-                if REROUTE_ON_RETRY and attempts < max_attempts:
-                    _reroute_job(latest2, attempt_id)
-
-                if attempts < max_attempts:
-                    nr = _backoff_iso(attempts)
-                    update_job(job_id, status="QUEUED", next_run_at=nr, worker_id=None)
-                    add_job_event(job_id, "RETRY", f"{e} | next_run_at={nr}")
+            done = {f for f in in_flight if f.done()}
+            in_flight -= done
+            for fut in done:
+                try:
+                    fut.result()
+                except Exception as e:
+                    print("[worker] JOB ERROR:", e)
+                    print(traceback.format_exc())
+
+            capacity = CONCURRENCY - len(in_flight)
+            batch = claim_next_jobs(WORKER_ID, n=min(BATCH_N, capacity)) if capacity > 0 else []
+            for job in batch:
+                in_flight.add(executor.submit(_run_job, job))
+
+            if not batch:
+                if in_flight:
+                    # saturated (or queue empty with work still running):
+                    # wake as soon as any attempt completes
+                    wait(in_flight, timeout=POLL_S, return_when=FIRST_COMPLETED)
                 else:
-                    update_job(job_id, status="FAILED", worker_id=WORKER_ID)
-                    add_job_event(job_id, "FAILED", tb)
+                    # idle; woken early by an in-process submit,
+                    # otherwise this is just the old POLL_S sleep
+                    wait_for_job(POLL_S)
 
         except KeyboardInterrupt:
             print("[worker] stopped by user")
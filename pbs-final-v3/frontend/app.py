@@ -1,12 +1,16 @@
 import os
 import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import numpy as np
+import orjson
+import pyarrow as pa
 import requests
 import pandas as pd
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 
 # ---------------- Config ----------------
 BACKEND = os.getenv("PBS_BACKEND", "http://127.0.0.1:8000").rstrip("/")
@@ -18,8 +22,13 @@ st.set_page_config(
 )
 
 # ---------------- Style ----------------
-st.markdown(
-    """
+# Emitted on every full script run on purpose: Streamlit prunes
+# elements that are not re-emitted, so gating this behind a
+# session_state flag would strip the styling on the next user
+# event. With the live tabs running as fragments, full runs (and
+# therefore this resend) only happen on real interactions, and
+# Streamlit's forward-message cache dedupes the unchanged payload.
+_CSS = """
 <style>
 :root{
   --bg: #0b1220;
@@ -112,104 +121,306 @@ st.markdown(
 }
 
 </style>
-""",
-    unsafe_allow_html=True,
-)
+"""
+
+st.markdown(_CSS, unsafe_allow_html=True)
+
+# Static badge/caption blocks used inside the auto-refreshing
+# fragments, hoisted to module constants like _CSS. They cannot be
+# render-once-gated behind session_state: a fragment rerun replaces the
+# fragment delta wholesale, so anything not re-emitted disappears.
+# Emitting the same constant each tick lets Streamlit forward-message
+# caching dedupe it on the wire instead.
+_DEMO_FLOW_HTML = """
+    <div class="section-sub">
+    Recommended judge flow (fast and convincing):
+    </div>
+    <div class="badge">1. Live Resources updating</div>
+    <div class="badge">2. Route Explorer explanation</div>
+    <div class="badge">3. Submit Jobs and watch lifecycle</div>
+    <div class="badge">4. Show reroute on failure</div>
+    <div class="badge">5. Show model metrics improving</div>
+    """
+
+_LEARN_BADGES_HTML = """
+    <div class="section-sub">
+    This is your “self improving” layer:
+    the system stores predicted values and real outcomes, then uses the gap to train better predictors.
+    </div>
+    <div class="badge">Features captured</div>
+    <div class="badge">Prediction made</div>
+    <div class="badge">Actual measured</div>
+    <div class="badge">Error computed</div>
+    <div class="badge">Model updated</div>
+    """
+
+_LEARN_NOTE_HTML = """
+    <div class="small-note">
+    What judges should understand:
+    Predicted latency and cost are checked against actual values.
+    That error becomes training data (supervised learning) so routing becomes smarter over time.
+    </div>
+    """
 
 # ---------------- Helpers ----------------
 def normalize_list(payload):
     """Accepts list OR dict wrappers like {value: [...]} and returns a list."""
-    if payload is None:
-        return []
     if isinstance(payload, list):
         return payload
     if isinstance(payload, dict):
-        if "value" in payload and isinstance(payload["value"], list):
-            return payload["value"]
-        if "items" in payload and isinstance(payload["items"], list):
-            return payload["items"]
-        # Sometimes API returns {"data": [...]}
-        if "data" in payload and isinstance(payload["data"], list):
-            return payload["data"]
+        # wrapper keys some endpoints use, e.g. {"data": [...]}
+        for k in ("value", "items", "data"):
+            v = payload.get(k)
+            if isinstance(v, list):
+                return v
     return []
 
 
+@contextmanager
+def section(title: str, sub: str | None = None):
+    """Section box emitted as one markdown message per edge.
+
+    The open/title/sub trio used to be three separate st.markdown
+    calls — three websocket messages and three React reconciles per
+    box per rerun. One combined message on enter, one close on exit.
+    """
+    head = f'<div class="section-box"><div class="section-title">{title}</div>'
+    if sub:
+        head += f'<div class="section-sub">{sub}</div>'
+    st.markdown(head, unsafe_allow_html=True)
+    try:
+        yield
+    finally:
+        st.markdown("</div>", unsafe_allow_html=True)
+
+
+@st.cache_resource(show_spinner=False)
+def get_session() -> requests.Session:
+    """One pooled Session for the whole app.
+
+    requests.get/post build a fresh Session (and TCP connection) per
+    call; with several endpoints polled every refresh that handshake
+    dominated wall time. Keep-alive on a shared pool reuses the socket.
+    """
+    s = requests.Session()
+    s.mount(BACKEND, requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    return s
+
+
+_BACKOFF_BASE_S = 2.0
+_BACKOFF_CAP_S = 60.0
+
+
+class BackendBackoff(RuntimeError):
+    """Raised in place of a network call while polling is backed off."""
+
+
+@st.cache_resource
+def _backoff_state() -> dict:
+    # Shared across sessions on purpose: when the backend answers
+    # 429/5xx, every open dashboard should slow down, not just the
+    # session that happened to see the error first.
+    return {"interval": 0.0, "until": 0.0}
+
+
+def _note_backend_error() -> None:
+    state = _backoff_state()
+    state["interval"] = min(_BACKOFF_CAP_S, max(_BACKOFF_BASE_S, state["interval"] * 2))
+    state["until"] = time.time() + state["interval"]
+
+
+def _note_backend_ok() -> None:
+    state = _backoff_state()
+    if state["interval"]:
+        state["interval"] = 0.0
+        state["until"] = 0.0
+
+
+@st.cache_resource
+def _etag_store() -> dict:
+    # path -> (etag, decoded body) for endpoints that emit ETags.
+    # Lives in cache_resource rather than session_state so the
+    # fetch-pool threads can touch it and all sessions share one copy.
+    return {}
+
+
 def safe_get(path: str, timeout: float = 5.0):
-    r = requests.get(f"{BACKEND}{path}", timeout=timeout)
+    # Adaptive polling: after a 429/5xx (or a dead socket) GETs are
+    # suppressed entirely until the backoff deadline, doubling up to
+    # _BACKOFF_CAP_S on repeated failures and resetting on the first
+    # success. The fragments keep waking at their usual cadence but hit
+    # this guard instead of the network, so a struggling backend is not
+    # hammered by every open session at once.
+    wait = _backoff_state()["until"] - time.time()
+    if wait > 0:
+        raise BackendBackoff(f"backend backoff active for another {wait:.0f}s")
+    cached = _etag_store().get(path)
+    try:
+        r = get_session().get(
+            f"{BACKEND}{path}",
+            timeout=timeout,
+            headers={"If-None-Match": cached[0]} if cached else None,
+        )
+    except requests.RequestException:
+        _note_backend_error()
+        raise
+    if r.status_code == 429 or r.status_code >= 500:
+        _note_backend_error()
+    else:
+        _note_backend_ok()
+    # 304: body unchanged since we last saw this ETag — reuse the
+    # decoded copy instead of transferring and parsing it again.
+    if r.status_code == 304 and cached:
+        return cached[1]
     r.raise_for_status()
-    return r.json()
+    # orjson decodes the raw bytes noticeably faster than r.json()'s
+    # stdlib parser on the larger /jobs and /resources payloads
+    data = orjson.loads(r.content)
+    etag = r.headers.get("ETag")
+    if etag:
+        _etag_store()[path] = (etag, data)
+    return data
 
 
 def safe_post(path: str, payload: dict, timeout: float = 8.0):
-    r = requests.post(f"{BACKEND}{path}", json=payload, timeout=timeout)
+    r = get_session().post(f"{BACKEND}{path}", json=payload, timeout=timeout)
     r.raise_for_status()
-    return r.json()
+    return orjson.loads(r.content)
+
+
+# Column selection/renaming for the resources table; numeric columns
+# are cast in one vectorized pass instead of per-cell float() calls.
+_RES_COLS = {
+    "resource_id": "Resource",
+    "resource_type": "Type",
+    "last.ts": "Time",
+    "last.cpu_util": "CPU",
+    "last.mem_util": "Memory",
+    "last.gpu_util": "GPU",
+    "last.net_rtt_ms": "RTT (ms)",
+    "last.net_bw_mbps": "Bandwidth (Mbps)",
+    "last.price_per_hour_usd": "Price Per Hour",
+    "last.reliability": "Reliability",
+    "last.power_w": "Power (W)",
+}
+_RES_NUM_COLS = [
+    "CPU", "Memory", "GPU", "RTT (ms)", "Bandwidth (Mbps)",
+    "Price Per Hour", "Reliability", "Power (W)",
+]
 
 
+# Both transforms below are pure functions of their JSON payload, so
+# st.cache_data (keyed on the pickled argument) skips the DataFrame
+# rebuild on widget-only reruns where the data did not change.
+@st.cache_data(show_spinner=False, max_entries=64)
 def clean_resources_df(resources: list[dict]) -> pd.DataFrame:
-    rows = []
-    for rr in resources:
-        t = rr.get("last", {})
-        rows.append(
-            {
-                "Resource": rr.get("resource_id"),
-                "Type": (rr.get("resource_type") or "").title(),
-                "Time": t.get("ts"),
-                "CPU": float(t.get("cpu_util", 0.0)),
-                "Memory": float(t.get("mem_util", 0.0)),
-                "GPU": float(t.get("gpu_util", 0.0)),
-                "RTT (ms)": float(t.get("net_rtt_ms", 0.0)),
-                "Bandwidth (Mbps)": float(t.get("net_bw_mbps", 0.0)),
-                "Price Per Hour": float(t.get("price_per_hour_usd", 0.0)),
-                "Reliability": float(t.get("reliability", 0.0)),
-                "Power (W)": float(t.get("power_w", 0.0)),
-            }
-        )
-    df = pd.DataFrame(rows)
-    if not df.empty and "Time" in df.columns:
-        df["Time"] = pd.to_datetime(df["Time"], errors="coerce")
+    if not resources:
+        return pd.DataFrame()
+    df = pd.json_normalize(resources, sep=".")
+    df = df.reindex(columns=list(_RES_COLS)).rename(columns=_RES_COLS)
+    df[_RES_NUM_COLS] = df[_RES_NUM_COLS].fillna(0.0).astype("float32")
+    df["Type"] = df["Type"].fillna("").str.title()
+    df["Time"] = pd.to_datetime(df["Time"], format="ISO8601", errors="coerce")
     return df
 
 
 def telemetry_history(df_now: pd.DataFrame, keep: int = 25) -> pd.DataFrame:
-    snap = datetime.utcnow().strftime("%H:%M:%S")
-    df = df_now.copy()
-    df["Snapshot"] = snap
+    """Rolling window of telemetry snapshots as one DataFrame.
 
-    hist = st.session_state.get("telemetry_hist", [])
-    hist.append(df)
-    hist = hist[-keep:]
-    st.session_state["telemetry_hist"] = hist
-    return pd.concat(hist, ignore_index=True)
+    The history lives in session_state as a deque ring buffer of plain
+    column arrays — appending drops the oldest slot in O(1) and no
+    DataFrame objects are retained between reruns. The output frame is
+    assembled with one np.concatenate per column instead of
+    pd.concat-ing `keep` frames on every refresh.
+    """
+    ring = st.session_state.get("tele_ring")
+    if ring is None or ring.maxlen != keep:
+        ring = deque(list(ring) if ring else [], maxlen=keep)
+        st.session_state["tele_ring"] = ring
+
+    # Snapshot is a 4-byte int id, not a broadcast time string — the
+    # object column cost ~10x the memory and serialized every row as a
+    # repeated string. The wall-clock label is kept once per snapshot
+    # and mapped in only where the animation displays it.
+    snap_id = st.session_state.get("_snap_id", 0) + 1
+    st.session_state["_snap_id"] = snap_id
+    labels = st.session_state.setdefault("tele_snap_labels", {})
+    labels[snap_id] = datetime.utcnow().strftime("%H:%M:%S")
+
+    frame = {c: df_now[c].to_numpy() for c in df_now.columns}
+    frame["Snapshot"] = np.full(len(df_now), snap_id, dtype=np.int32)
+    ring.append(frame)
+
+    # drop labels for snapshots that fell out of the ring
+    live = {int(f["Snapshot"][0]) for f in ring if len(f["Snapshot"])}
+    for k in [k for k in labels if k not in live]:
+        del labels[k]
+
+    return pd.DataFrame(
+        {c: np.concatenate([f[c] for f in ring]) for c in frame.keys()}
+    )
 
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def job_outcomes_df(jobs: list[dict]) -> pd.DataFrame:
     df = pd.DataFrame(jobs)
-    if df.empty:
-        return df
-
-    if "status" not in df.columns:
+    if df.empty or "status" not in df.columns:
         return pd.DataFrame()
 
-    df = df[df["status"] == "COMPLETED"].copy()
+    # one combined mask and one selection instead of
+    # filter -> copy -> filter again
+    mask = df["status"].to_numpy() == "COMPLETED"
+    if "actual_latency_ms" in df.columns and "actual_cost_usd" in df.columns:
+        # keep only jobs with actuals
+        mask &= df["actual_latency_ms"].notna().to_numpy()
+        mask &= df["actual_cost_usd"].notna().to_numpy()
+    df = df.loc[mask]
     if df.empty:
         return df
 
-    for col in ["updated_at", "created_at"]:
+    for col in ("updated_at", "created_at"):
         if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors="coerce")
-
-    # keep only jobs with actuals
-    if "actual_latency_ms" in df.columns and "actual_cost_usd" in df.columns:
-        df = df[df["actual_latency_ms"].notna() & df["actual_cost_usd"].notna()]
+            df[col] = pd.to_datetime(df[col], format="ISO8601", errors="coerce")
 
     df = df.sort_values("updated_at" if "updated_at" in df.columns else df.columns[0])
-    df["Step"] = range(1, len(df) + 1)
+    df["Step"] = np.arange(1, len(df) + 1, dtype=np.int32)
     return df
 
 
+
+# KPI rows are rebuilt as f-strings on every refresh even when the
+# numbers have not moved; caching on the scalar tuple skips both the
+# formatting and Streamlit re-diffing an identical markdown block.
+@st.cache_data(show_spinner=False, max_entries=32)
+def kpi_html_overview(completed: int, lat_mae: float, cost_mae: float) -> str:
+    return f"""
+    <div class="kpi-row">
+      <div class="kpi"><div class="kpi-label">Completed Jobs</div><div class="kpi-value">{completed}</div></div>
+      <div class="kpi"><div class="kpi-label">Latency MAE</div><div class="kpi-value">{lat_mae:.1f} ms</div></div>
+      <div class="kpi"><div class="kpi-label">Cost MAE</div><div class="kpi-value">{cost_mae:.6f}</div></div>
+      <div class="kpi"><div class="kpi-label">Learning Loop</div><div class="kpi-value">On</div></div>
+    </div>
+    """
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def kpi_html_resources(total: int, edge: int, cloud: int, gpu: int, avg_rtt: float, avg_rel: float) -> str:
+    return f"""
+    <div class="kpi-row">
+      <div class="kpi"><div class="kpi-label">Resources</div><div class="kpi-value">{total}</div></div>
+      <div class="kpi"><div class="kpi-label">Edge / Cloud / GPU</div><div class="kpi-value">{edge} / {cloud} / {gpu}</div></div>
+      <div class="kpi"><div class="kpi-label">Average RTT</div><div class="kpi-value">{avg_rtt:.1f} ms</div></div>
+      <div class="kpi"><div class="kpi-label">Average Reliability</div><div class="kpi-value">{avg_rel:.3f}</div></div>
+    </div>
+    """
+
+
 def timeline_figure(events_payload):
     """Robust timeline: works for list OR dict wrapper."""
+    # deferred so importing plotly (~200ms, ~30MB) is paid on first
+    # chart render, not at app start; later calls hit sys.modules
+    import plotly.graph_objects as go
+
     ev = normalize_list(events_payload)
     if not ev:
         fig = go.Figure()
@@ -232,7 +443,7 @@ def timeline_figure(events_payload):
 
     df = pd.DataFrame(ev)
     if "ts" in df.columns:
-        df["ts"] = pd.to_datetime(df["ts"], errors="coerce")
+        df["ts"] = pd.to_datetime(df["ts"], format="ISO8601", errors="coerce")
         df = df.sort_values("ts")
     else:
         df["ts"] = pd.NaT
@@ -240,8 +451,10 @@ def timeline_figure(events_payload):
     df["idx"] = range(1, len(df) + 1)
 
     fig = go.Figure()
+    # Scattergl renders the whole trace as one WebGL draw call instead
+    # of per-point SVG nodes, which matters once event counts grow
     fig.add_trace(
-        go.Scatter(
+        go.Scattergl(
             x=df["ts"],
             y=df["idx"],
             mode="lines+markers+text",
@@ -388,6 +601,8 @@ def job_form(prefix: str):
 
 
 def considered_table(decision: dict):
+    import plotly.express as px
+
     considered = decision.get("considered", []) if isinstance(decision, dict) else []
     if not considered:
         st.info("No considered resources returned.")
@@ -412,6 +627,13 @@ def considered_table(decision: dict):
         )
 
     df = pd.DataFrame(flat)
+    # float32 halves the Arrow payload st.dataframe ships to the
+    # browser; these scores never need float64 precision
+    score_cols = [
+        "Final Score", "Effective Score", "Predicted Latency (ms)",
+        "Predicted Cost (USD)", "Reliability", "Congestion",
+    ]
+    df[score_cols] = df[score_cols].astype("float32")
     df = df.sort_values(["SLA OK", "Effective Score"], ascending=[False, False])
 
     st.dataframe(
@@ -430,7 +652,7 @@ def considered_table(decision: dict):
     )
 
     fig = px.bar(
-        df,
+        df[["Resource", "Effective Score", "Type"]],
         x="Resource",
         y="Effective Score",
         color="Type",
@@ -470,6 +692,122 @@ with st.sidebar:
     )
     st.caption("Run worker in a separate terminal to execute queued jobs.")
 
+# Every tab re-fires its GETs on every rerun (including the auto-refresh
+# loop); caching by path with a TTL of one refresh window collapses the
+# duplicate round-trips into one fetch per endpoint per window.
+# Cache-safety taxonomy: "info" endpoints are idempotent reads and may
+# sit behind st.cache_data; "command" endpoints change state and must
+# hit the backend every time. Everything mutating today goes through
+# safe_post, so the guard below is defensive — it keeps a future GET
+# with side effects from silently being absorbed by the TTL cache.
+# Keep this table honest when adding endpoints.
+ENDPOINT_POLICY = {
+    "/health": "info",
+    "/resources": "info",
+    "/jobs": "info",
+    "/jobs/sla-events": "info",
+    "/jobs/model-metrics": "info",
+    "/dashboard/summary": "info",
+    # POST-only today, listed so nobody caches a GET twin by accident
+    "/route": "command",
+}
+
+
+def _endpoint_class(path: str) -> str:
+    p = path.split("?", 1)[0]
+    policy = ENDPOINT_POLICY.get(p)
+    if policy:
+        return policy
+    if p.endswith(("/cancel", "/complete")):
+        return "command"
+    # per-job reads: /jobs/<id>, /jobs/<id>/events, /jobs/<id>/attempts
+    if p.startswith("/jobs/"):
+        return "info"
+    return "command"
+
+
+@st.cache_data(ttl=max(1.0, float(refresh)), show_spinner=False)
+def _cached_info_get(path: str, timeout: float = 5.0):
+    return safe_get(path, timeout=timeout)
+
+
+def cached_get(path: str, timeout: float = 5.0):
+    if _endpoint_class(path) != "info":
+        return safe_get(path, timeout=timeout)
+    return _cached_info_get(path, timeout)
+
+
+# Force Refresh and the fragments clear/inspect the underlying cache.
+cached_get.clear = _cached_info_get.clear
+
+
+# SLA events and model metrics arrive batched from one endpoint, so a
+# poll cycle costs one round trip instead of two. TTL follows the
+# faster-moving half (SLA events); the metrics computation riding along
+# is a single vectorized pass on the backend and too cheap to split out.
+@st.cache_data(ttl=5, show_spinner=False)
+def cached_dashboard_summary():
+    return safe_get("/dashboard/summary")
+
+
+def cached_sla_events():
+    return cached_dashboard_summary()["sla_events"]
+
+
+def cached_model_metrics():
+    return cached_dashboard_summary()["model_metrics"]
+
+
+def cached_sla_total() -> int:
+    return cached_dashboard_summary().get("sla_events_total", 0)
+
+
+# how long a last-known-good copy may be served when the backend is down
+_STALE_MAX_S = 600
+
+
+def fetch_with_fallback(key: str, fetch):
+    """Fetch, keeping the last good response as a stale fallback.
+
+    During a backend restart the tabs used to flip to a bare error with
+    no data. On failure this serves the copy stashed in session_state
+    (if younger than _STALE_MAX_S) and reports its age so the caller
+    can flag it; only when there is no usable copy does it re-raise.
+    Returns (data, stale_age_seconds_or_None).
+    """
+    try:
+        data = fetch()
+        st.session_state[key] = (time.time(), data)
+        return data, None
+    except Exception:
+        stashed = st.session_state.get(key)
+        if stashed is not None:
+            age = time.time() - stashed[0]
+            if age < _STALE_MAX_S:
+                return stashed[1], age
+        raise
+
+
+# Independent GETs on one tab are fanned out through this pool so wall
+# time is the slowest call, not the sum; requests releases the GIL
+# while blocked on the socket.
+@st.cache_resource(show_spinner=False)
+def fetch_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="fetch")
+
+
+with st.sidebar:
+    if st.button("Force Refresh Data", help="Bypass the fetch cache and reload from backend"):
+        cached_get.clear()
+        cached_dashboard_summary.clear()
+        st.rerun()
+
+# Live tabs re-run as fragments on this interval instead of the old
+# whole-page time.sleep + st.rerun loop, so a refresh re-executes only
+# the fragment body — the sidebar, CSS and static tabs run once per
+# real user event.
+_RUN_EVERY = refresh if refresh > 0 else None
+
 # ---------------- Tabs ----------------
 tabs = st.tabs(
     [
@@ -484,72 +822,64 @@ tabs = st.tabs(
 )
 
 # ---------------- Overview ----------------
-with tabs[0]:
-    st.markdown('<div class="section-box">', unsafe_allow_html=True)
-    st.markdown('<div class="section-title"><span class="pulse"></span>System Status</div>', unsafe_allow_html=True)
-    st.markdown('<div class="section-sub">Use this first in front of judges: “everything is live.”</div>', unsafe_allow_html=True)
+@st.fragment(run_every=_RUN_EVERY)
+def overview_tab():
+    with section(
+        '<span class="pulse"></span>System Status',
+        "Use this first in front of judges: “everything is live.”",
+    ):
+        health_fut = fetch_pool().submit(cached_get, "/health", 2.0)
+        mm_fut = fetch_pool().submit(cached_model_metrics)
+
+        left, right = st.columns([1, 1])
+        with left:
+            try:
+                health = health_fut.result()
+                st.success(health)
+            except Exception as e:
+                st.error(f"Backend not reachable: {e}")
+
+        with right:
+            try:
+                mm = mm_fut.result()
+                st.markdown(
+                    kpi_html_overview(
+                        mm.get("completed_jobs", 0),
+                        mm.get("latency_mae_ms", 0),
+                        mm.get("cost_mae_usd", 0),
+                    ),
+                    unsafe_allow_html=True,
+                )
+            except Exception:
+                st.info("Model metrics not available yet.")
 
-    left, right = st.columns([1, 1])
-    with left:
-        try:
-            health = safe_get("/health", timeout=2)
-            st.success(health)
-        except Exception as e:
-            st.error(f"Backend not reachable: {e}")
+    with section("Demo Flow"):
+        st.markdown(_DEMO_FLOW_HTML, unsafe_allow_html=True)
 
-    with right:
-        try:
-            mm = safe_get("/jobs/model-metrics", timeout=3)
-            st.markdown(
-                f"""
-                <div class="kpi-row">
-                  <div class="kpi"><div class="kpi-label">Completed Jobs</div><div class="kpi-value">{mm.get("completed_jobs", 0)}</div></div>
-                  <div class="kpi"><div class="kpi-label">Latency MAE</div><div class="kpi-value">{mm.get("latency_mae_ms", 0):.1f} ms</div></div>
-                  <div class="kpi"><div class="kpi-label">Cost MAE</div><div class="kpi-value">{mm.get("cost_mae_usd", 0):.6f}</div></div>
-                  <div class="kpi"><div class="kpi-label">Learning Loop</div><div class="kpi-value">On</div></div>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
-        except Exception:
-            st.info("Model metrics not available yet.")
-
-    st.markdown("</div>", unsafe_allow_html=True)
-
-    st.markdown('<div class="section-box">', unsafe_allow_html=True)
-    st.markdown('<div class="section-title">Demo Flow</div>', unsafe_allow_html=True)
-    st.markdown(
-        """
-<div class="section-sub">
-Recommended judge flow (fast and convincing):
-</div>
-<div class="badge">1. Live Resources updating</div>
-<div class="badge">2. Route Explorer explanation</div>
-<div class="badge">3. Submit Jobs and watch lifecycle</div>
-<div class="badge">4. Show reroute on failure</div>
-<div class="badge">5. Show model metrics improving</div>
-""",
-        unsafe_allow_html=True,
-    )
-    st.markdown("</div>", unsafe_allow_html=True)
+
+with tabs[0]:
+    overview_tab()
 
 # ---------------- Live Resources ----------------
-with tabs[1]:
-    st.markdown('<div class="section-box">', unsafe_allow_html=True)
-    st.markdown('<div class="section-title"><span class="pulse"></span>Live Resources (Latest Telemetry)</div>', unsafe_allow_html=True)
-    st.markdown('<div class="section-sub">Clean table + animated curves using recent telemetry snapshots.</div>', unsafe_allow_html=True)
+@st.fragment(run_every=_RUN_EVERY)
+def live_resources_tab():
+    import plotly.express as px
+
+    with section(
+        '<span class="pulse"></span>Live Resources (Latest Telemetry)',
+        "Clean table + animated curves using recent telemetry snapshots.",
+    ):
+        try:
+            resources = cached_get("/resources")
+        except Exception as e:
+            st.error(f"Failed to load resources: {e}")
+            st.stop()
 
-    try:
-        resources = safe_get("/resources", timeout=5)
-    except Exception as e:
-        st.error(f"Failed to load resources: {e}")
-        st.stop()
+        df = clean_resources_df(resources)
+        if df.empty:
+            st.warning("No telemetry yet. Run telemetry simulator script from backend.")
+            return
 
-    df = clean_resources_df(resources)
-    if df.empty:
-        st.warning("No telemetry yet. Run telemetry simulator script from backend.")
-        st.markdown("</div>", unsafe_allow_html=True)
-    else:
         avg_rtt = df["RTT (ms)"].mean()
         avg_rel = df["Reliability"].mean()
         total = len(df)
@@ -558,14 +888,10 @@ with tabs[1]:
         edge_count = int((df["Type"] == "Edge").sum())
 
         st.markdown(
-            f"""
-            <div class="kpi-row">
-              <div class="kpi"><div class="kpi-label">Resources</div><div class="kpi-value">{total}</div></div>
-              <div class="kpi"><div class="kpi-label">Edge / Cloud / GPU</div><div class="kpi-value">{edge_count} / {cloud_count} / {gpu_count}</div></div>
-              <div class="kpi"><div class="kpi-label">Average RTT</div><div class="kpi-value">{avg_rtt:.1f} ms</div></div>
-              <div class="kpi"><div class="kpi-label">Average Reliability</div><div class="kpi-value">{avg_rel:.3f}</div></div>
-            </div>
-            """,
+            kpi_html_resources(
+                total, edge_count, cloud_count, gpu_count,
+                round(avg_rtt, 1), round(avg_rel, 3),
+            ),
             unsafe_allow_html=True,
         )
 
@@ -574,10 +900,13 @@ with tabs[1]:
         adv_cols = ["Bandwidth (Mbps)", "Power (W)"]
         cols = base_cols + (adv_cols if show_advanced else [])
 
-        df_show = df[cols].copy().sort_values(["Type", "Resource"])
+        df_show = df[cols].sort_values(["Type", "Resource"])
 
+        # pre-convert to Arrow (pyarrow ships with Streamlit) so the
+        # sorted table is serialized zero-copy instead of having
+        # st.dataframe run the pandas->Arrow conversion per rerun
         st.dataframe(
-            df_show,
+            pa.Table.from_pandas(df_show, preserve_index=False),
             use_container_width=True,
             height=360,
             hide_index=True,
@@ -593,77 +922,108 @@ with tabs[1]:
             },
         )
 
-        st.markdown("</div>", unsafe_allow_html=True)
-
-        # Animated telemetry curve
-        st.markdown('<div class="section-box">', unsafe_allow_html=True)
-        st.markdown('<div class="section-title">Latency and Cost Curve (Animated)</div>', unsafe_allow_html=True)
-        st.markdown('<div class="section-sub">This animates using recent telemetry snapshots. Turn on auto refresh for live motion.</div>', unsafe_allow_html=True)
 
+    # Animated telemetry curve
+    with section(
+        "Latency and Cost Curve (Animated)",
+        "This animates using recent telemetry snapshots. Turn on auto refresh for live motion.",
+    ):
+        # keep recording snapshots so the animation has frames when the
+        # user turns it on; the ring append itself is cheap
         hist = telemetry_history(
             df[["Resource", "Type", "RTT (ms)", "Price Per Hour", "Power (W)"]],
             keep=telemetry_frames,
         )
-        hist = hist.sort_values(["Snapshot", "Type", "RTT (ms)"])
-
-        fig = px.line(
-            hist,
-            x="RTT (ms)",
-            y="Price Per Hour",
-            color="Type",
-            line_shape="spline",
-            animation_frame="Snapshot",
-            markers=True,
-            hover_name="Resource",
-        )
-        fig.update_layout(
-            margin=dict(l=10, r=10, t=10, b=10),
-            legend_title_text="Type",
-        )
-        fig.layout.updatemenus = [
-            {
-                "type": "buttons",
-                "showactive": False,
-                "x": 1.02,
-                "y": 1.15,
-                "buttons": [
-                    {
-                        "label": "Play",
-                        "method": "animate",
-                        "args": [
-                            None,
-                            {
-                                "frame": {"duration": 350, "redraw": True},
-                                "transition": {"duration": 220},
-                                "fromcurrent": True,
-                            },
-                        ],
-                    },
-                    {
-                        "label": "Pause",
-                        "method": "animate",
-                        "args": [
-                            [None],
-                            {
-                                "mode": "immediate",
-                                "frame": {"duration": 0, "redraw": False},
-                                "transition": {"duration": 0},
-                            },
-                        ],
-                    },
-                ],
-            }
-        ]
-        st.plotly_chart(fig, use_container_width=True)
-        st.markdown("</div>", unsafe_allow_html=True)
 
-        # Job outcomes curve
-        st.markdown('<div class="section-box">', unsafe_allow_html=True)
-        st.markdown('<div class="section-title">Job Outcomes Curve (Grows as Tasks Complete)</div>', unsafe_allow_html=True)
-        st.markdown('<div class="section-sub">This is the “proof” panel: as jobs finish, this curve grows automatically.</div>', unsafe_allow_html=True)
+        # With auto refresh on, the page itself already produces motion,
+        # yet the animated figure serializes every frame over the
+        # websocket on each rerun (keep x resources rows of JSON). Only
+        # build the multi-frame figure when explicitly requested.
+        show_anim = st.toggle("Show history animation", value=(refresh == 0))
+
+        if not show_anim:
+            # only the plotted columns go over the websocket
+            fig = px.scatter(
+                df[["Resource", "Type", "RTT (ms)", "Price Per Hour"]],
+                x="RTT (ms)",
+                y="Price Per Hour",
+                color="Type",
+                hover_name="Resource",
+                render_mode="webgl",
+            )
+            fig.update_layout(
+                margin=dict(l=10, r=10, t=10, b=10),
+                legend_title_text="Type",
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            hist = hist.sort_values(["Snapshot", "Type", "RTT (ms)"])
+            # the history ring also carries Power (W) for other panels;
+            # Plotly serializes whatever frame it is given, so hand it
+            # only the plotted columns
+            labels = st.session_state.get("tele_snap_labels", {})
+            hist_plot = hist[["Type", "RTT (ms)", "Price Per Hour", "Resource"]].assign(
+                Snapshot=hist["Snapshot"].map(labels)
+            )
 
+            fig = px.line(
+                hist_plot,
+                x="RTT (ms)",
+                y="Price Per Hour",
+                color="Type",
+                line_shape="spline",
+                animation_frame="Snapshot",
+                markers=True,
+                hover_name="Resource",
+                render_mode="webgl",
+            )
+            fig.update_layout(
+                margin=dict(l=10, r=10, t=10, b=10),
+                legend_title_text="Type",
+            )
+            fig.layout.updatemenus = [
+                {
+                    "type": "buttons",
+                    "showactive": False,
+                    "x": 1.02,
+                    "y": 1.15,
+                    "buttons": [
+                        {
+                            "label": "Play",
+                            "method": "animate",
+                            "args": [
+                                None,
+                                {
+                                    "frame": {"duration": 350, "redraw": True},
+                                    "transition": {"duration": 220},
+                                    "fromcurrent": True,
+                                },
+                            ],
+                        },
+                        {
+                            "label": "Pause",
+                            "method": "animate",
+                            "args": [
+                                [None],
+                                {
+                                    "mode": "immediate",
+                                    "frame": {"duration": 0, "redraw": False},
+                                    "transition": {"duration": 0},
+                                },
+                            ],
+                        },
+                    ],
+                }
+            ]
+            st.plotly_chart(fig, use_container_width=True)
+
+    # Job outcomes curve
+    with section(
+        "Job Outcomes Curve (Grows as Tasks Complete)",
+        "This is the “proof” panel: as jobs finish, this curve grows automatically.",
+    ):
         try:
-            jobs = safe_get("/jobs", timeout=5)
+            jobs = cached_get("/jobs")
         except Exception:
             jobs = []
 
@@ -678,6 +1038,7 @@ with tabs[1]:
                 markers=True,
                 line_shape="spline",
                 hover_name="job_id",
+                render_mode="webgl",
             )
             fig2.update_layout(
                 xaxis_title="Actual Latency (ms)",
@@ -686,67 +1047,68 @@ with tabs[1]:
             )
             st.plotly_chart(fig2, use_container_width=True)
 
-        st.markdown("</div>", unsafe_allow_html=True)
+
+with tabs[1]:
+    live_resources_tab()
 
 # ---------------- Route Explorer ----------------
 with tabs[2]:
-    st.markdown('<div class="section-box">', unsafe_allow_html=True)
-    st.markdown('<div class="section-title">Route Explorer</div>', unsafe_allow_html=True)
-    st.markdown('<div class="section-sub">Explains how the router chooses Edge, Cloud, or GPU under SLA constraints.</div>', unsafe_allow_html=True)
-
-    payload = job_form("Route")
-
-    if st.button("Compute Route Decision"):
-        try:
-            dec = safe_post("/route", payload)
-            if dec.get("chosen_resource_id") == "none":
-                st.error(dec.get("explanation", "No route found"))
-            else:
-                st.success(dec.get("explanation", "Route computed"))
-            considered_table(dec)
-        except Exception as e:
-            st.error(f"Route failed: {e}")
-
-    st.markdown("</div>", unsafe_allow_html=True)
+    with section(
+        "Route Explorer",
+        "Explains how the router chooses Edge, Cloud, or GPU under SLA constraints.",
+    ):
+        payload = job_form("Route")
+
+        if st.button("Compute Route Decision"):
+            try:
+                dec = safe_post("/route", payload)
+                if dec.get("chosen_resource_id") == "none":
+                    st.error(dec.get("explanation", "No route found"))
+                else:
+                    st.success(dec.get("explanation", "Route computed"))
+                considered_table(dec)
+            except Exception as e:
+                st.error(f"Route failed: {e}")
 
 # ---------------- Submit Jobs ----------------
 with tabs[3]:
-    st.markdown('<div class="section-box">', unsafe_allow_html=True)
-    st.markdown('<div class="section-title">Submit Jobs (Queue for Worker)</div>', unsafe_allow_html=True)
-    st.markdown('<div class="section-sub">Submits to the backend. Worker picks it up and executes. Use “force first attempt failure” to demo reroute.</div>', unsafe_allow_html=True)
+    with section(
+        "Submit Jobs (Queue for Worker)",
+        "Submits to the backend. Worker picks it up and executes. Use “force first attempt failure” to demo reroute.",
+    ):
+        payload = job_form("Submit")
+        if st.button("Submit Job"):
+            try:
+                out = safe_post("/jobs", payload)
+                st.success(f"Submitted. Status: {out.get('status')}")
+                dec = out.get("decision", {})
+                if dec:
+                    st.write(dec.get("explanation", ""))
+                    considered_table(dec)
+
+                st.info("Open Job Monitor tab to watch events and attempts.")
+            except Exception as e:
+                st.error(f"Submit failed: {e}")
 
-    payload = job_form("Submit")
-    if st.button("Submit Job"):
-        try:
-            out = safe_post("/jobs", payload)
-            st.success(f"Submitted. Status: {out.get('status')}")
-            dec = out.get("decision", {})
-            if dec:
-                st.write(dec.get("explanation", ""))
-                considered_table(dec)
+# ---------------- Job Monitor ----------------
+@st.fragment(run_every=_RUN_EVERY)
+def job_monitor_tab():
+    import plotly.graph_objects as go
 
-            st.info("Open Job Monitor tab to watch events and attempts.")
+    with section(
+        "Job Monitor",
+        "Pick a job and show lifecycle: submitted → running → rerouted/retry → completed.",
+    ):
+        try:
+            jobs = cached_get("/jobs")
         except Exception as e:
-            st.error(f"Submit failed: {e}")
-
-    st.markdown("</div>", unsafe_allow_html=True)
+            st.error(f"Failed to load jobs: {e}")
+            jobs = []
 
-# ---------------- Job Monitor ----------------
-with tabs[4]:
-    st.markdown('<div class="section-box">', unsafe_allow_html=True)
-    st.markdown('<div class="section-title">Job Monitor</div>', unsafe_allow_html=True)
-    st.markdown('<div class="section-sub">Pick a job and show lifecycle: submitted → running → rerouted/retry → completed.</div>', unsafe_allow_html=True)
+        if not jobs:
+            st.info("No jobs yet. Submit one from Submit Jobs tab.")
+            return
 
-    try:
-        jobs = safe_get("/jobs", timeout=5)
-    except Exception as e:
-        st.error(f"Failed to load jobs: {e}")
-        jobs = []
-
-    if not jobs:
-        st.info("No jobs yet. Submit one from Submit Jobs tab.")
-        st.markdown("</div>", unsafe_allow_html=True)
-    else:
         dfj = pd.DataFrame(jobs)
 
         cols = [
@@ -765,7 +1127,12 @@ with tabs[4]:
             ]
             if c in dfj.columns
         ]
-        st.dataframe(dfj[cols], use_container_width=True, height=280, hide_index=True)
+        st.dataframe(
+            pa.Table.from_pandas(dfj[cols], preserve_index=False),
+            use_container_width=True,
+            height=280,
+            hide_index=True,
+        )
 
         job_ids = dfj["job_id"].tolist()
         sel = st.selectbox("Select Job", job_ids, index=0)
@@ -784,19 +1151,25 @@ with tabs[4]:
         with c3:
             st.caption("If job is stuck queued, worker is not running.")
 
+        futs = {
+            "details": fetch_pool().submit(cached_get, f"/jobs/{sel}"),
+            "events": fetch_pool().submit(cached_get, f"/jobs/{sel}/events"),
+            "attempts": fetch_pool().submit(cached_get, f"/jobs/{sel}/attempts"),
+        }
+
         try:
-            details = safe_get(f"/jobs/{sel}", timeout=5)
+            details = futs["details"].result()
         except Exception as e:
             st.error(f"Failed to load job details: {e}")
             details = {}
 
         try:
-            events_payload = safe_get(f"/jobs/{sel}/events", timeout=5)
+            events_payload = futs["events"].result()
         except Exception:
             events_payload = []
 
         try:
-            attempts_payload = safe_get(f"/jobs/{sel}/attempts", timeout=5)
+            attempts_payload = futs["attempts"].result()
         except Exception:
             attempts_payload = []
 
@@ -840,11 +1213,11 @@ with tabs[4]:
                 done = dfa[dfa["status"] == "COMPLETED"].copy()
                 if not done.empty:
                     fig_pa = go.Figure()
-                    fig_pa.add_trace(go.Scatter(
+                    fig_pa.add_trace(go.Scattergl(
                         x=done["attempt_no"], y=done["predicted_latency_ms"],
                         mode="lines+markers", name="Predicted Latency"
                     ))
-                    fig_pa.add_trace(go.Scatter(
+                    fig_pa.add_trace(go.Scattergl(
                         x=done["attempt_no"], y=done["actual_latency_ms"],
                         mode="lines+markers", name="Actual Latency"
                     ))
@@ -858,67 +1231,99 @@ with tabs[4]:
         else:
             st.info("No attempts yet.")
 
-        st.markdown("</div>", unsafe_allow_html=True)
+
+with tabs[4]:
+    job_monitor_tab()
 
 # ---------------- SLA and Events ----------------
-with tabs[5]:
-    st.markdown('<div class="section-box">', unsafe_allow_html=True)
-    st.markdown('<div class="section-title">SLA and System Events</div>', unsafe_allow_html=True)
-    st.markdown('<div class="section-sub">Show blocked jobs and SLA violations here. This proves SLA control is real.</div>', unsafe_allow_html=True)
+@st.cache_data(show_spinner=False, max_entries=64)
+def sla_events_df(sla_events: list) -> pd.DataFrame:
+    # Handing pandas a list of dicts makes it type-sniff row by row;
+    # pivoting to {column: values} first builds each column in a single
+    # pass and copy=False adopts the lists without another copy.
+    cols = {k: [e.get(k) for e in sla_events] for k in sla_events[0]}
+    df = pd.DataFrame(cols, copy=False)
+    # Repeated strings (status, resource ids/types) become category
+    # codes and float64 predictions drop to float32 — the display only
+    # shows a 320px window, and the smaller frame is what gets
+    # serialized over the websocket every refresh. Columns holding
+    # lists (violations) are unhashable and stay as-is.
+    n = len(df)
+    for c in df.select_dtypes("object").columns:
+        try:
+            if df[c].nunique() / n < 0.5:
+                df[c] = df[c].astype("category")
+        except TypeError:
+            pass
+    for c in df.select_dtypes("float64").columns:
+        df[c] = df[c].astype("float32")
+    for c in df.select_dtypes("int64").columns:
+        df[c] = pd.to_numeric(df[c], downcast="integer")
+    return df
 
-    try:
-        sla_events = safe_get("/jobs/sla-events", timeout=5)
-    except Exception as e:
-        st.error(f"Failed to load SLA events: {e}")
-        sla_events = []
 
-    if not sla_events:
-        st.info("No SLA events so far.")
-    else:
-        df = pd.DataFrame(sla_events)
-        st.dataframe(df, use_container_width=True, height=320, hide_index=True)
+@st.fragment(run_every=_RUN_EVERY)
+def sla_events_tab():
+    with section(
+        "SLA and System Events",
+        "Show blocked jobs and SLA violations here. This proves SLA control is real.",
+    ):
+        # Only one table window is visible at a time, so only one page
+        # of rows crosses the network per refresh: page 1 rides along in
+        # the batched summary, deeper pages are fetched on demand.
+        page_size = 50
+        page = 1
+        try:
+            total = cached_sla_total()
+        except Exception:
+            total = 0
+        if total > page_size:
+            pages = -(-total // page_size)
+            page = int(st.number_input(
+                "Page", min_value=1, max_value=pages, step=1, key="sla_page",
+                help=f"{total} events, {page_size} per page",
+            ))
+        try:
+            if page == 1:
+                sla_events, stale_age = fetch_with_fallback("_last_sla_events", cached_sla_events)
+            else:
+                offset = (page - 1) * page_size
+                sla_events, stale_age = fetch_with_fallback(
+                    f"_last_sla_events_{page}",
+                    lambda: cached_get(f"/jobs/sla-events?offset={offset}&limit={page_size}"),
+                )
+            if stale_age is not None:
+                st.warning(f"Backend unreachable — showing data {stale_age:.0f}s old.")
+        except Exception as e:
+            st.error(f"Failed to load SLA events: {e}")
+            sla_events = []
 
-    st.markdown("</div>", unsafe_allow_html=True)
+        if not sla_events:
+            st.info("No SLA events so far.")
+        else:
+            df = sla_events_df(sla_events)
+            st.dataframe(df, use_container_width=True, height=320, hide_index=True)
+
+
+with tabs[5]:
+    sla_events_tab()
 
 # ---------------- Model and Learning ----------------
-with tabs[6]:
-    st.markdown('<div class="section-box">', unsafe_allow_html=True)
-    st.markdown('<div class="section-title">Model and Learning Loop</div>', unsafe_allow_html=True)
-    st.markdown(
-        """
-<div class="section-sub">
-This is your “self improving” layer:
-the system stores predicted values and real outcomes, then uses the gap to train better predictors.
-</div>
-<div class="badge">Features captured</div>
-<div class="badge">Prediction made</div>
-<div class="badge">Actual measured</div>
-<div class="badge">Error computed</div>
-<div class="badge">Model updated</div>
-""",
-        unsafe_allow_html=True,
-    )
+@st.fragment(run_every=_RUN_EVERY)
+def model_tab():
+    with section("Model and Learning Loop"):
+        st.markdown(_LEARN_BADGES_HTML, unsafe_allow_html=True)
 
-    try:
-        mm = safe_get("/jobs/model-metrics", timeout=5)
-        st.json(mm)
-    except Exception as e:
-        st.error(f"Failed to load model metrics: {e}")
-
-    st.markdown(
-        """
-<div class="small-note">
-What judges should understand:
-Predicted latency and cost are checked against actual values.
-That error becomes training data (supervised learning) so routing becomes smarter over time.
-</div>
-""",
-        unsafe_allow_html=True,
-    )
+        try:
+            mm, stale_age = fetch_with_fallback("_last_model_metrics", cached_model_metrics)
+            if stale_age is not None:
+                st.warning(f"Backend unreachable — showing data {stale_age:.0f}s old.")
+            st.json(mm, expanded=False)
+        except Exception as e:
+            st.error(f"Failed to load model metrics: {e}")
 
-    st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown(_LEARN_NOTE_HTML, unsafe_allow_html=True)
 
-# ---------------- Auto refresh ----------------
-if refresh > 0:
-    time.sleep(refresh)
-    st.rerun()
+
+with tabs[6]:
+    model_tab()